@@ -2,6 +2,7 @@ import base64
 import io
 import os
 import re
+import threading
 
 import numpy as np
 import requests
@@ -15,6 +16,8 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import dotenv
 
+from jobs import JobStore, JobQueueFullError
+
 dotenv.load_dotenv()
 app = Flask(__name__)
 
@@ -493,28 +496,47 @@ class IntentRouter:
 
 # Global router instance (you'll need to provide your Google API key)
 router = None
+router_api_key = None
 
+# Request and job threads each get their own router, so LLM chains are never shared across threads
+thread_routers = threading.local()
 
-@app.route('/process-mention', methods=['POST'])
-def process_mention():
-    global router
 
+# Background executor for asynchronous mention processing
+job_store = JobStore(
+    max_workers=int(os.getenv('JOB_WORKERS', 4)),
+    max_pending=int(os.getenv('JOB_MAX_PENDING', 32)),
+    result_ttl=int(os.getenv('JOB_RESULT_TTL', 3600))
+)
+
+
+def validate_mention_payload(data):
+    """Return an error response if the mention payload is unusable, else None"""
     # Ensure router is initialized
     if router is None:
         return jsonify({'error': 'Router not initialized. Set GOOGLE_API_KEY.'}), 500
 
-    # Extract data from payload
-    data = request.get_json()
-
     # Validate input
     if not data or 'userCommand' not in data or 'originalTweet' not in data:
         return jsonify({'error': 'Invalid payload. Requires userCommand and originalTweet'}), 400
 
+    return None
+
+
+def current_router():
+    """This thread's router, created on first use from the initialized router's key"""
+    if getattr(thread_routers, 'router', None) is None:
+        thread_routers.router = IntentRouter(router_api_key)
+    return thread_routers.router
+
+
+def build_mention_response(data):
+    """Route a mention payload and build the response sent back to the bot"""
     user_command = data['userCommand']
     original_tweet = data['originalTweet']
     media_data = data.get('mediaData', '')
     # Route the instruction with media awareness
-    route_name, confidence, django_response = router.route_instruction(
+    route_name, confidence, django_response = current_router().route_instruction(
         user_command,
         original_tweet,
         media_data
@@ -537,12 +559,58 @@ def process_mention():
     if media_data != '':
         response['mediaData'] = media_data
 
+    return response
+
+
+@app.route('/process-mention', methods=['POST'])
+def process_mention():
+    # Extract data from payload
+    data = request.get_json()
+
+    error = validate_mention_payload(data)
+    if error:
+        return error
+
+    return jsonify(build_mention_response(data))
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_mention_job():
+    """Queue a mention for background processing and return its job id right away"""
+    data = request.get_json()
+
+    error = validate_mention_payload(data)
+    if error:
+        return error
+
+    try:
+        job = job_store.submit(build_mention_response, data, job_key=data.get('jobKey'))
+    except JobQueueFullError as e:
+        return jsonify({'error': 'Job queue is full, retry later', 'details': str(e)}), 503
+
+    return jsonify({'jobId': job['job_id'], 'status': job['status']}), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_mention_job(job_id):
+    """Report the status of a job, including its result once it is done"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+
+    response = {'jobId': job['job_id'], 'status': job['status']}
+    if job['status'] == 'done':
+        response['result'] = job['result']
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+
     return jsonify(response)
 
 
 def initialize_router(api_key):
     """Initialize the global router with Gemini API key"""
-    global router
+    global router, router_api_key
+    router_api_key = api_key
     router = IntentRouter(api_key)
 
 
@@ -3,12 +3,23 @@ import base64
 import logging
 import os
 import re
+import sys
+import time
+from collections import OrderedDict
 from typing import List
 
 import dotenv
 import httpx
 from atproto import AsyncClient, models,client_utils
 
+from jetstream import JetstreamListener
+from media import MediaStage
+from resolver import HandleResolver
+
+# SessionManager lives with the scraper; appended so router modules keep precedence
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraper'))
+from session_manager import SessionManager  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,7 +29,15 @@ logger = logging.getLogger(__name__)
 
 
 class BlueSkyBot:
-    MAX_IMAGE_SIZE = 10_000_000
+    # Bluesky rejects image blobs over ~976 KB
+    MAX_IMAGE_SIZE = 976_560
+    JOB_POLL_INTERVAL = 3
+    JOB_TIMEOUT = 300
+    POLL_INTERVAL = 30
+    RECONCILE_INTERVAL = 300
+    QUEUE_WORKERS = 4
+    MAX_PROCESSED_URIS = 10_000
+    MENTION_PATTERN = r'@([a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?)'
 
     def __init__(self):
         # Load environment variables
@@ -27,14 +46,28 @@ class BlueSkyBot:
         # Initialize Bluesky async client
         self.client = AsyncClient()
         self.session = httpx.AsyncClient()  # Use httpx for more modern async requests
-
-    async def login(self):
-        """Login to Bluesky"""
+        self.media = MediaStage(
+            self.client,
+            self.MAX_IMAGE_SIZE,
+            os.path.join(os.path.dirname(__file__), 'blob_cache.json')
+        )
+        self.resolver = HandleResolver(self.client)
+        self.session_manager = SessionManager(
+            os.getenv('BLUESKY_HANDLE'),
+            os.getenv('BLUESKY_PASSWORD'),
+            os.path.join(os.path.dirname(__file__), '.sessions')
+        )
+
+        # Mentions waiting to be processed, and URIs already handled by either ingestion path
+        self.queue = asyncio.Queue(maxsize=100)
+        self.processed_uris = OrderedDict()
+        self.in_flight_uris = set()
+        self.queued_uris = set()
+
+    async def login(self, force=False):
+        """Login to Bluesky, reusing the saved session unless force is set"""
         try:
-            await self.client.login(
-                os.getenv('BLUESKY_HANDLE'),
-                os.getenv('BLUESKY_PASSWORD')
-            )
+            await self.session_manager.login_async(self.client, force=force)
             logger.info(f'Logged in as: {os.getenv("BLUESKY_HANDLE")}')
         except Exception as e:
             logger.error(f'Login failed: {e}', exc_info=True)
@@ -117,18 +150,44 @@ class BlueSkyBot:
                         'originalTweet': root_text if root_text != '' else user_text
                     }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{os.getenv('API_MIDDLEWARE')}/process-mention",
-                    json=data,timeout=120
-                )
-                response_data = response.json()
+            # Key the job by mention so a retried notification reuses finished work
+            data['jobKey'] = mention.uri
+            response_data = await self.run_middleware_job(data)
+            if response_data is None:
+                return False
             return await self.handle_response_category(response_data, mention, root_post)
 
         except Exception as e:
             logger.error(f'Middleware processing error: {e}', exc_info=True)
             return False
 
+    async def run_middleware_job(self, data):
+        """Submit a job to the middleware and poll until its result is ready"""
+        base_url = os.getenv('API_MIDDLEWARE')
+        response = await self.session.post(f"{base_url}/jobs", json=data, timeout=10)
+        response.raise_for_status()
+        job_id = response.json()['jobId']
+        logger.info(f"Submitted middleware job {job_id}")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.JOB_TIMEOUT
+        while loop.time() < deadline:
+            response = await self.session.get(f"{base_url}/jobs/{job_id}", timeout=10)
+            response.raise_for_status()
+            job = response.json()
+
+            if job['status'] == 'done':
+                return job['result']
+            if job['status'] == 'failed':
+                logger.error(f"Middleware job {job_id} failed: {job.get('error')}")
+                return None
+
+            await asyncio.sleep(self.JOB_POLL_INTERVAL)
+
+        # The job keeps running; the next check picks it up by its job key
+        logger.warning(f"Middleware job {job_id} still running after {self.JOB_TIMEOUT}s")
+        return None
+
     async def handle_response_category(self, response_data, mention, root_post):
         """Handle different response categories"""
         category = response_data.get('category')
@@ -223,12 +282,16 @@ class BlueSkyBot:
             reply_to_root = models.create_strong_ref(root_post if root_post else mention)
             reply_to_parent = models.create_strong_ref(mention)
 
+            text = await self.build_facets(reply_text)
             if image_embed:
-                await self.client.send_image(image_alt=reply_text, image=image_embed, text=self.parse_text_to_facets(reply_text),
-                                             reply_to=models.AppBskyFeedPost.ReplyRef(parent=reply_to_parent,
-                                                                                      root=reply_to_root))
+                started_at = time.perf_counter()
+                embed = await self.media.prepare_embed(image_embed, reply_text)
+                await self.client.send_post(text=text, embed=embed,
+                                            reply_to=models.AppBskyFeedPost.ReplyRef(parent=reply_to_parent,
+                                                                                     root=reply_to_root))
+                self.media.log_stats(started_at)
             else:
-                await self.client.send_post(text=self.parse_text_to_facets(reply_text),
+                await self.client.send_post(text=text,
                                             reply_to=models.AppBskyFeedPost.ReplyRef(parent=reply_to_parent,
                                                                                      root=reply_to_root))
             logger.info('Successfully replied to mention')
@@ -247,9 +310,37 @@ class BlueSkyBot:
             logger.error(f'Error getting root post: {e}', exc_info=True)
             return None
 
+    async def handle_mention(self, mention):
+        """Process a single mention once, whichever ingestion path delivered it"""
+        if mention.uri in self.processed_uris:
+            return True
+        # Still being handled by the other path; report unfinished so it is not marked read yet
+        if mention.uri in self.in_flight_uris:
+            return False
+
+        self.in_flight_uris.add(mention.uri)
+        try:
+            # Get the root post if it's a reply
+            root_post = await self.get_root_post(mention.record.reply.parent.uri) if mention.record.reply else None
+            mention_post = await self.get_root_post(mention.uri)
+
+            # Process the mention
+            process_result = await self.process_middleware_response(mention, root_post, mention_post)
+        finally:
+            self.in_flight_uris.discard(mention.uri)
+
+        if process_result:
+            self.processed_uris[mention.uri] = True
+            while len(self.processed_uris) > self.MAX_PROCESSED_URIS:
+                self.processed_uris.popitem(last=False)
+        return process_result
+
     async def check_mentions(self):
-        """Check and process new mentions"""
+        """Check for unread mentions and queue them for the workers"""
         try:
+            # Only notifications indexed before this poll started are marked as read
+            seen_at = self.client.get_current_time_iso()
+
             # Get notifications
             notifications = await self.client.app.bsky.notification.list_notifications()
 
@@ -262,46 +353,101 @@ class BlueSkyBot:
             if not mentions:
                 return
 
-            logger.info(f'Processing {len(mentions)} new mentions...')
-
+            # Hand new mentions to the workers; a full queue is retried on the next poll
+            queued = 0
             for mention in mentions:
-                # Get the root post if it's a reply
-                root_post = await self.get_root_post(mention.record.reply.parent.uri) if mention.record.reply else None
-                mention_post = await self.get_root_post(mention.uri)
-
-                # Process the mention
-                process_result = await self.process_middleware_response(mention, root_post, mention_post)
-
-                # Mark notifications as read
-                if process_result :
-                    await self.client.app.bsky.notification.update_seen({
-                        'seen_at': self.client.get_current_time_iso()
-                    })
-                    logger.info("Marked as read!")
-                else:
-                    logger.error("Failed to mark as read!")
+                if self.enqueue(mention.uri, mention):
+                    queued += 1
+            if queued:
+                logger.info(f'Queued {queued} new mentions...')
+
+            # Mark notifications as read once every unread mention has been handled
+            if all(mention.uri in self.processed_uris for mention in mentions):
+                await self.client.app.bsky.notification.update_seen({
+                    'seen_at': seen_at
+                })
+                logger.info("Marked as read!")
 
         except Exception as e:
             logger.error(f'Check mentions error: {e}', exc_info=True)
             # Attempt re-login if authentication error
-            if 'auth' in str(e).lower():
-                await self.login()
+            if SessionManager.is_auth_error(e) or 'auth' in str(e).lower():
+                await self.login(force=True)
 
-    async def run_bot(self):
-        """Main bot run method"""
-        await self.login()
-        logger.info('Bot started! Checking mentions every 30 seconds...')
+    def enqueue(self, uri, mention=None):
+        """Queue a mention unless it is handled, in flight or already queued; returns True if queued"""
+        if uri in self.processed_uris or uri in self.in_flight_uris or uri in self.queued_uris:
+            return False
+        try:
+            self.queue.put_nowait((uri, mention))
+        except asyncio.QueueFull:
+            logger.warning(f'Mention queue full, leaving {uri} for a later check')
+            return False
+        self.queued_uris.add(uri)
+        return True
 
+    async def enqueue_stream_post(self, uri):
+        """Queue a post URI delivered by the event stream"""
+        self.enqueue(uri)
+
+    async def process_queue(self):
+        """Worker that processes queued mentions, hydrating streamed URIs first"""
+        while True:
+            uri, mention = await self.queue.get()
+            self.queued_uris.discard(uri)
+            try:
+                if mention is None:
+                    mention = await self.get_root_post(uri)
+                if mention:
+                    await self.handle_mention(mention)
+            except Exception as e:
+                logger.error(f'Queue processing error for {uri}: {e}', exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    async def reconcile_mentions(self, interval):
+        """Poll notifications periodically to catch anything the stream missed"""
         while True:
             await self.check_mentions()
-            await asyncio.sleep(30)
+            await asyncio.sleep(interval)
 
-    def parse_text_to_facets(self,text) :
+    async def run_bot(self):
+        """Main bot run method"""
+        await self.login()
+
+        workers = [self.process_queue() for _ in range(self.QUEUE_WORKERS)]
+        jetstream_url = os.getenv('JETSTREAM_URL')
+        if not jetstream_url:
+            logger.info(f'Bot started! Checking mentions every {self.POLL_INTERVAL} seconds...')
+            await asyncio.gather(self.reconcile_mentions(self.POLL_INTERVAL), *workers)
+            return
+
+        listener = JetstreamListener(jetstream_url, self.client.me.did, self.enqueue_stream_post)
+        logger.info(
+            f'Bot started! Streaming mentions from {jetstream_url}, '
+            f'reconciling every {self.RECONCILE_INTERVAL} seconds...'
+        )
+        await asyncio.gather(
+            listener.run(),
+            self.reconcile_mentions(self.RECONCILE_INTERVAL),
+            *workers
+        )
+
+    async def build_facets(self, text):
+        """Resolve the handles mentioned in text, then build its facets"""
+        handles = [match.group(1) for match in re.finditer(self.MENTION_PATTERN, text)]
+        dids = await self.resolver.resolve_many(handles) if handles else {}
+        if handles:
+            logger.info(f'Handle cache hit rate: {self.resolver.hit_rate:.1%}')
+        return self.parse_text_to_facets(text, dids)
+
+    def parse_text_to_facets(self, text, dids=None):
         """
         Parse a string and automatically create appropriate facets for mentions, links, and tags.
 
         Args:
             text (str): Input text to parse and create facets for
+            dids (dict): Resolved handle -> DID mapping; unresolved mentions stay plain text
 
         Returns:
             client_utils.TextBuilder: TextBuilder object with detected facets
@@ -310,7 +456,7 @@ class BlueSkyBot:
         text_builder = client_utils.TextBuilder()
 
         # Regular expressions for detection
-        mention_pattern = r'@(\w+)'
+        mention_pattern = self.MENTION_PATTERN
         url_pattern = r'https?://\S+'
         tag_pattern = r'#(\w+)'
 
@@ -343,8 +489,11 @@ class BlueSkyBot:
 
             # Add the matched content with appropriate facet
             if match_type == 'mention':
-                # Assumes a did lookup or placeholder - in real world, you'd want to resolve the DID
-                text_builder.mention(match.group(1), f'did:placeholder:{match.group(1)}')
+                did = (dids or {}).get(match.group(1).lower())
+                if did:
+                    text_builder.mention(match.group(0), did)
+                else:
+                    text_builder.text(match.group(0))
             elif match_type == 'link':
                 text_builder.link(match.group(0), match.group(0))
             elif match_type == 'tag':
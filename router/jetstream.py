@@ -0,0 +1,79 @@
+import asyncio
+import json
+import logging
+from urllib.parse import urlencode
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+POST_COLLECTION = 'app.bsky.feed.post'
+MENTION_FACET = 'app.bsky.richtext.facet#mention'
+
+
+class JetstreamListener:
+    """Subscribe to a Jetstream event stream and surface posts that mention or reply to one DID"""
+
+    RECONNECT_DELAY = 5
+
+    def __init__(self, url, bot_did, on_post):
+        self.url = url
+        self.bot_did = bot_did
+        self.on_post = on_post
+
+        # Microsecond timestamp of the last event seen, used to resume after a reconnect
+        self.cursor = None
+
+    def subscribe_url(self):
+        """Build the subscription URL, resuming from the cursor if we have one"""
+        params = [('wantedCollections', POST_COLLECTION)]
+        if self.cursor:
+            params.append(('cursor', self.cursor))
+        separator = '&' if '?' in self.url else '?'
+        return f'{self.url}{separator}{urlencode(params)}'
+
+    def is_addressed_to_bot(self, event):
+        """Return the post URI if the event is a new post mentioning or replying to the bot"""
+        commit = event.get('commit') or {}
+        if (event.get('kind') != 'commit' or commit.get('operation') != 'create'
+                or commit.get('collection') != POST_COLLECTION):
+            return None
+
+        # Ignore the bot's own replies
+        if event.get('did') == self.bot_did:
+            return None
+
+        record = commit.get('record') or {}
+        uri = f"at://{event['did']}/{POST_COLLECTION}/{commit['rkey']}"
+
+        parent_uri = ((record.get('reply') or {}).get('parent') or {}).get('uri', '')
+        if parent_uri.startswith(f'at://{self.bot_did}/'):
+            return uri
+
+        for facet in record.get('facets') or []:
+            for feature in facet.get('features') or []:
+                if feature.get('$type') == MENTION_FACET and feature.get('did') == self.bot_did:
+                    return uri
+
+        return None
+
+    async def run(self):
+        """Consume the stream forever, reconnecting from the last cursor on failure"""
+        while True:
+            try:
+                async with websockets.connect(self.subscribe_url()) as websocket:
+                    logger.info(f'Subscribed to event stream at {self.url}')
+                    async for message in websocket:
+                        event = json.loads(message)
+                        self.cursor = event.get('time_us', self.cursor)
+
+                        uri = self.is_addressed_to_bot(event)
+                        if uri:
+                            logger.info(f'Stream mention received: {uri}')
+                            await self.on_post(uri)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Event stream error: {e}', exc_info=True)
+
+            await asyncio.sleep(self.RECONNECT_DELAY)
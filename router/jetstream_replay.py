@@ -0,0 +1,94 @@
+"""
+Local stand-in for a Jetstream endpoint that replays recorded events.
+
+Record events from a real endpoint with one JSON object per line, then run
+    python jetstream_replay.py events.jsonl --port 6008
+and point the bot at it with JETSTREAM_URL=ws://localhost:6008/subscribe.
+
+Recorded mentions address the account that was logged in when they were
+recorded. Pass --bot-did with the DID the bot now logs in as to rewrite
+mention facets and reply parents to it, so the listener accepts them.
+
+The bundled sample_events/jetstream_mentions.jsonl uses made-up DIDs and post
+URIs. It exercises the listener's filtering and queueing only: the bot cannot
+fetch those posts, so get_root_post logs an error and the mention is dropped.
+Replay a real recording to run mentions end to end.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s - [Line: %(lineno)d]'
+)
+logger = logging.getLogger(__name__)
+
+
+def load_events(path, recorded_did=None, bot_did=None):
+    """Load recorded events ordered by timestamp, rewriting the recorded bot DID if asked"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    if recorded_did and bot_did:
+        # DIDs only appear as whole JSON strings or at:// URI authorities
+        lines = [
+            line.replace(f'"{recorded_did}"', f'"{bot_did}"').replace(f'at://{recorded_did}/', f'at://{bot_did}/')
+            for line in lines
+        ]
+    events = [json.loads(line) for line in lines]
+    return sorted(events, key=lambda event: event.get('time_us', 0))
+
+
+async def replay(websocket, events, speed):
+    """Send events to one subscriber, honouring cursor and wantedCollections"""
+    request_path = websocket.request.path if hasattr(websocket, 'request') else websocket.path
+    params = parse_qs(urlparse(request_path).query)
+    cursor = int(params.get('cursor', ['0'])[0])
+    collections = set(params.get('wantedCollections', []))
+
+    previous_time = None
+    sent = 0
+    for event in events:
+        if event.get('time_us', 0) <= cursor:
+            continue
+        collection = (event.get('commit') or {}).get('collection')
+        if collections and collection not in collections:
+            continue
+
+        # Preserve the recorded spacing between events, scaled by speed
+        if previous_time is not None and speed > 0:
+            await asyncio.sleep((event['time_us'] - previous_time) / 1_000_000 / speed)
+        previous_time = event.get('time_us', previous_time)
+
+        await websocket.send(json.dumps(event))
+        sent += 1
+
+    logger.info(f'Replayed {sent} events')
+    await websocket.wait_closed()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Replay recorded Jetstream events over a websocket')
+    parser.add_argument('events', help='JSONL file of recorded events')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=6008)
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed multiplier, 0 for no delay')
+    parser.add_argument('--bot-did', help='DID the bot logs in as; replaces --recorded-bot-did in the events')
+    parser.add_argument('--recorded-bot-did', default='did:plc:examplebot',
+                        help='Bot DID the events were recorded against')
+    args = parser.parse_args()
+
+    events = load_events(args.events, args.recorded_bot_did, args.bot_did)
+    logger.info(f'Loaded {len(events)} events from {args.events}')
+
+    async with websockets.serve(lambda ws, *_: replay(ws, events, args.speed), args.host, args.port):
+        logger.info(f'Serving on ws://{args.host}:{args.port}/subscribe')
+        await asyncio.Future()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job store has no room for another pending job"""
+
+
+class JobStore:
+    """
+    Bounded background executor for middleware jobs with TTL'd results.
+
+    Jobs submitted with the same key share one job, so a caller retrying a
+    request picks up the running or finished job instead of recomputing it.
+    """
+
+    def __init__(self, max_workers=4, max_pending=32, result_ttl=3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='middleware-job')
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+
+        self._jobs = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, job_key=None, **kwargs):
+        """Submit work and return its job record, reusing an existing job for the same key"""
+        with self._lock:
+            self._evict_expired()
+
+            if job_key and job_key in self._keys:
+                existing = self._jobs[self._keys[job_key]]
+                # Failed jobs are retried; queued, running and done ones are shared
+                if existing['status'] != 'failed':
+                    return dict(existing)
+                del self._jobs[existing['job_id']]
+
+            pending = sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f'{pending} jobs already pending')
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'job_key': job_key,
+                'status': 'queued',
+                'result': None,
+                'error': None,
+                'created_at': time.time(),
+                'finished_at': None
+            }
+            if job_key:
+                self._keys[job_key] = job_id
+
+            job = dict(self._jobs[job_id])
+
+        self.executor.submit(self._run, job_id, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        """Return a snapshot of a job, or None if unknown or expired"""
+        with self._lock:
+            self._evict_expired()
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _run(self, job_id, fn, args, kwargs):
+        self._update(job_id, status='running')
+        try:
+            result = fn(*args, **kwargs)
+            self._update(job_id, status='done', result=result, finished_at=time.time())
+        except Exception as e:
+            self._update(job_id, status='failed', error=str(e), finished_at=time.time())
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _evict_expired(self):
+        """Drop finished jobs older than the result TTL (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and job['finished_at'] < cutoff
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if job['job_key']:
+                self._keys.pop(job['job_key'], None)
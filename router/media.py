@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+from atproto import models
+from atproto_client.models.blob_ref import BlobRef, IpldLink
+
+logger = logging.getLogger(__name__)
+
+
+class MediaStage:
+    """
+    Shrink images to fit Bluesky's blob limit and reuse blobs already uploaded.
+
+    Images are recompressed (and downscaled if needed) off the event loop, then
+    keyed by the SHA-256 of the final bytes; a cache hit reuses the stored blob
+    ref instead of calling upload_blob again. Refs expire after BLOB_TTL, since
+    the PDS may delete a blob once the posts referencing it are gone.
+    """
+
+    JPEG_QUALITIES = (85, 75, 65, 55)
+    DOWNSCALE_FACTOR = 0.75
+    MAX_CACHE_ENTRIES = 5000
+    BLOB_TTL = 24 * 3600
+
+    def __init__(self, client, max_bytes, cache_path, max_workers=2):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.cache_path = cache_path
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='media')
+
+        self.blob_cache = self._load_cache()
+        self.save_lock = threading.Lock()
+        self.stats = {
+            'uploads': 0,
+            'cache_hits': 0,
+            'bytes_in': 0,
+            'bytes_uploaded': 0,
+            'bytes_saved': 0
+        }
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _is_fresh(self, entry):
+        # Entries saved before refs carried a timestamp count as expired
+        return time.time() - entry.get('cached_at', 0) < self.BLOB_TTL
+
+    def _snapshot_cache(self):
+        """Trim and copy the cache on the event loop thread, so it can be written elsewhere"""
+        for digest in [digest for digest, entry in self.blob_cache.items() if not self._is_fresh(entry)]:
+            del self.blob_cache[digest]
+        # Keep only the newest entries; dicts preserve insertion order
+        while len(self.blob_cache) > self.MAX_CACHE_ENTRIES:
+            self.blob_cache.pop(next(iter(self.blob_cache)))
+        return dict(self.blob_cache)
+
+    def _save_cache(self, snapshot):
+        # Two workers may save at once; the lock keeps them off the same tmp file
+        with self.save_lock:
+            tmp_path = f'{self.cache_path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.cache_path)
+
+    def shrink(self, image_bytes):
+        """Recompress and downscale until the image fits; returns (bytes, width, height)"""
+        image = Image.open(io.BytesIO(image_bytes))
+        width, height = image.size
+
+        if len(image_bytes) <= self.max_bytes:
+            return image_bytes, width, height
+
+        if image.mode not in ('RGB', 'L'):
+            # JPEG has no alpha; flatten transparency onto white rather than black
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+
+        while True:
+            for quality in self.JPEG_QUALITIES:
+                buffer = io.BytesIO()
+                image.save(buffer, format='JPEG', quality=quality, optimize=True)
+                if buffer.tell() <= self.max_bytes:
+                    return buffer.getvalue(), image.width, image.height
+
+            new_size = (int(image.width * self.DOWNSCALE_FACTOR), int(image.height * self.DOWNSCALE_FACTOR))
+            if min(new_size) < 1:
+                raise ValueError('Image cannot be shrunk below the blob limit')
+            image = image.resize(new_size, Image.LANCZOS)
+
+    async def prepare_embed(self, image_bytes, alt_text):
+        """Build an image embed for a post, uploading the image only if it is not cached"""
+        loop = asyncio.get_running_loop()
+        data, width, height = await loop.run_in_executor(self.executor, self.shrink, image_bytes)
+        digest = hashlib.sha256(data).hexdigest()
+
+        self.stats['bytes_in'] += len(image_bytes)
+        cached = self.blob_cache.get(digest)
+        if cached and not self._is_fresh(cached):
+            del self.blob_cache[digest]
+            cached = None
+        if cached:
+            self.stats['cache_hits'] += 1
+            self.stats['bytes_saved'] += len(image_bytes)
+            blob = BlobRef(mime_type=cached['mime_type'], size=cached['size'], ref=IpldLink(link=cached['cid']))
+        else:
+            upload = await self.client.upload_blob(data)
+            blob = upload.blob
+            self.blob_cache[digest] = {
+                'mime_type': blob.mime_type,
+                'size': blob.size,
+                'cid': str(blob.cid),
+                'cached_at': time.time()
+            }
+            await loop.run_in_executor(self.executor, self._save_cache, self._snapshot_cache())
+
+            self.stats['uploads'] += 1
+            self.stats['bytes_uploaded'] += len(data)
+            self.stats['bytes_saved'] += len(image_bytes) - len(data)
+
+        return models.AppBskyEmbedImages.Main(images=[
+            models.AppBskyEmbedImages.Image(
+                alt=alt_text,
+                image=blob,
+                aspect_ratio=models.AppBskyEmbedDefs.AspectRatio(width=width, height=height)
+            )
+        ])
+
+    def log_stats(self, started_at):
+        """Log cumulative media stats along with the time spent on this reply"""
+        logger.info(
+            f"Media stage: {time.perf_counter() - started_at:.2f}s this reply, "
+            f"{self.stats['uploads']} uploads, {self.stats['cache_hits']} cache hits, "
+            f"{self.stats['bytes_saved']} upload bytes saved"
+        )
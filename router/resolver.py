@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from atproto_client.exceptions import BadRequestError
+
+logger = logging.getLogger(__name__)
+
+
+class HandleResolver:
+    """
+    Resolve Bluesky handles to DIDs with an LRU+TTL cache.
+
+    Unknown handles are cached as negative entries for a shorter TTL. Lookups
+    that time out or fail transiently (5xx, rate limits, dropped connections)
+    are not cached, so a flaky resolver never poisons the cache.
+    """
+
+    def __init__(self, client, max_entries=10_000, ttl=6 * 60 * 60, negative_ttl=10 * 60, lookup_timeout=2.0):
+        self.client = client
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lookup_timeout = lookup_timeout
+
+        # handle -> (did or None, expires_at)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @staticmethod
+    def is_resolvable(handle):
+        """Handles are domain names, so anything without a dot cannot resolve"""
+        return '.' in handle
+
+    def _get_cached(self, handle):
+        entry = self._cache.get(handle)
+        if entry is None:
+            return False, None
+
+        did, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._cache[handle]
+            return False, None
+
+        self._cache.move_to_end(handle)
+        return True, did
+
+    def _put(self, handle, did):
+        ttl = self.ttl if did else self.negative_ttl
+        self._cache[handle] = (did, time.monotonic() + ttl)
+        self._cache.move_to_end(handle)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def _lookup(self, handle):
+        try:
+            response = await asyncio.wait_for(
+                self.client.com.atproto.identity.resolve_handle({'handle': handle}),
+                timeout=self.lookup_timeout
+            )
+            self._put(handle, response.did)
+            return response.did
+        except asyncio.TimeoutError:
+            logger.warning(f'Handle lookup timed out: {handle}')
+            return None
+        except BadRequestError as e:
+            # The server answered that the handle does not exist
+            logger.info(f'Handle did not resolve: {handle} ({e})')
+            self._put(handle, None)
+            return None
+
+    async def resolve_many(self, handles):
+        """Resolve a set of handles concurrently, returning a handle -> DID (or None) mapping"""
+        resolved = {}
+        pending = []
+        for handle in {handle.lower() for handle in handles}:
+            if not self.is_resolvable(handle):
+                resolved[handle] = None
+                continue
+
+            found, did = self._get_cached(handle)
+            if found:
+                self.hits += 1
+                resolved[handle] = did
+            else:
+                self.misses += 1
+                pending.append(handle)
+
+        if pending:
+            dids = await asyncio.gather(*[self._lookup(handle) for handle in pending], return_exceptions=True)
+            for handle, did in zip(pending, dids):
+                if isinstance(did, Exception):
+                    # Left uncached and unresolved for this post only
+                    logger.warning(f'Handle lookup failed: {handle} ({did})')
+                    did = None
+                resolved[handle] = did
+
+        return resolved
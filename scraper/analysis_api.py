@@ -3,6 +3,7 @@ import json
 import logging
 import os
 import re
+import time
 import traceback
 from datetime import datetime
 
@@ -10,21 +11,116 @@ from atproto import Client, client_utils, models
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import TfidfVectorizer
-from transformers import pipeline
 from dotenv import load_dotenv
+
+from analysis_pipeline import make_cpu_pool, run_analysis_cycle
+from analysis_store import store
+from change_detector import ChangeDetector
+from feature_store import FeatureStore
+from model_registry import registry
+from sentiment import SentimentScorer
+from session_manager import SessionManager
+from topic_clusterer import TopicClusterer
+
 load_dotenv()
+
+
+def load_gemini():
+    return ChatGoogleGenerativeAI(
+        model="gemini-pro",
+        google_api_key=os.getenv('GEMINI_KEY')  # Replace with your API key
+    )
+
+
 class TrendAnalyzer:
-    def __init__(self, logger=None):
+    # Category name variations -> prompt category
+    CATEGORY_MAP = {
+        'finance': 'financial',
+        'crypto': 'crypto',
+        'cryptocurrency': 'crypto',
+        'tech': 'tech',
+        'technology': 'tech',
+        'entertainment': 'entertainment',
+        'media': 'entertainment'
+    }
+
+    # Per prompt category: what the texts are, their label in the prompt and the insights asked for.
+    # Both the per-category and the batched insights prompts are built from this table.
+    INSIGHT_PROMPTS = {
+        'financial': {
+            'subject': 'financial market',
+            'label': 'Financial',
+            'focus': [
+                'Current market sentiment and key financial trends',
+                'Emerging investment opportunities',
+                'Potential economic risks and challenges',
+                'Sector-specific insights',
+                'Short-term and long-term market outlook'
+            ]
+        },
+        'crypto': {
+            'subject': 'cryptocurrency and blockchain',
+            'label': 'Crypto',
+            'focus': [
+                'Current cryptocurrency market trends',
+                'Emerging blockchain technologies',
+                'Regulatory landscape updates',
+                'Potential investment strategies',
+                'Market sentiment and volatility indicators'
+            ]
+        },
+        'tech': {
+            'subject': 'technology industry',
+            'label': 'Tech',
+            'focus': [
+                'Cutting-edge technological innovations',
+                'Emerging tech trends',
+                'Potential disruptive technologies',
+                'Industry investment opportunities',
+                'Impact of recent technological developments'
+            ]
+        },
+        'entertainment': {
+            'subject': 'entertainment industry',
+            'label': 'Entertainment',
+            'focus': [
+                'Current entertainment trends',
+                'Emerging content and media innovations',
+                'Audience engagement insights',
+                'Potential industry shifts',
+                'Notable upcoming releases and developments'
+            ]
+        }
+    }
+
+    # Returned when Gemini fails; never recorded or reused as a category's insight baseline
+    FALLBACK_INSIGHTS = "Trending insights for {category}: Key developments observed"
+
+    def __init__(self, logger=None, models=None):
         """
         Initialize TrendAnalyzer with logging and ML models
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.models = models or registry
 
         # Ensure directories exist
         self.ensure_directories_exist()
 
+        # Per-category topic models, updated every cycle and kept on disk
+        self.clusterers = {}
+        # Per-post sentiment, term vectors and hashtags, so each post is scored once
+        self.feature_store = FeatureStore(
+            os.path.join('data', 'post_features.sqlite'),
+            SentimentScorer.model_id_from_env("ProsusAI/finbert")
+        )
+        self.seconds_per_post = None
+
+        # Reuse the last insights while a category's top posts barely change
+        self.change_detector = ChangeDetector(
+            os.path.join('data', 'insight_changes.json'),
+            threshold=float(os.getenv('INSIGHT_CHANGE_THRESHOLD', 0.2))
+        )
+
         # Initialize models
         self._init_models()
 
@@ -33,6 +129,7 @@ class TrendAnalyzer:
         directories = [
             'logs',
             'data/trends',
+            'data/topic_models',
             'analysis_results'
         ]
 
@@ -40,149 +137,85 @@ class TrendAnalyzer:
             os.makedirs(directory, exist_ok=True)
 
     def _init_models(self):
-        """Initialize machine learning models"""
-        try:
-            # Financial sentiment model
-            self.financial_sentiment = pipeline(
-                "sentiment-analysis",
-                model="ProsusAI/finbert",
-                top_k=None
-            )
+        """Register machine learning models; each loads on first use and stays warm"""
+        # Financial sentiment model, scored in length-sorted batches
+        self.models.register('finbert', lambda: SentimentScorer.from_env("ProsusAI/finbert"))
+
+        # Gemini for advanced analysis
+        self.models.register('gemini', load_gemini)
+
+    @property
+    def financial_sentiment(self):
+        return self.models.get('finbert')
 
-            # Gemini for advanced analysis
-            self.gemini_llm = ChatGoogleGenerativeAI(
-                model="gemini-pro",
-                google_api_key=os.getenv('GEMINI_KEY')  # Replace with your API key
+    @property
+    def gemini_llm(self):
+        return self.models.get('gemini')
+
+    def _clusterer(self, category):
+        if category not in self.clusterers:
+            self.clusterers[category] = TopicClusterer(
+                os.path.join('data', 'topic_models', f'{category}_topics.pkl')
             )
-        except Exception as e:
-            self.logger.error(f"Model initialization failed: {e}")
-            raise
-
-    def advanced_sentiment_analysis(self, texts):
-        """Advanced sentiment analysis for given texts"""
-        sentiments = []
-        for text in texts:
-            result = self.financial_sentiment(text)[0]
-            sentiments.append({
-                'text': text,
-                'sentiment': result[0]['label'],
-                'confidence': result[0]['score']
-            })
+        return self.clusterers[category]
 
-        sentiments_sorted = sorted(sentiments, key=lambda x: x['confidence'], reverse=True)
-        return {
-            'top_positive': [s for s in sentiments_sorted if s['sentiment'] == 'positive'][:5],
-            'top_negative': [s for s in sentiments_sorted if s['sentiment'] == 'negative'][:5],
-            'total_analyzed': len(texts)
-        }
+    def _perform_topic_clustering(self, texts, category='default', X=None):
+        """Update the category's persistent topic clusters and return labels with top terms per topic"""
+        return self._clusterer(category).update(texts, X)
 
-    def _perform_topic_clustering(self, texts):
-        """Perform topic clustering using TF-IDF and KMeans"""
-        if not texts:
-            return {'clusters': [], 'centroids': []}
+    def cached_features(self, category, posts):
+        """Sentiment summary and term vectors for posts, scoring only posts missing from the feature store"""
+        clusterer = self._clusterer(category)
 
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-        X = vectorizer.fit_transform(texts)
+        def compute(texts):
+            return self.financial_sentiment.score(texts), clusterer.vectorize(texts)
 
-        n_clusters = min(3, len(texts))
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-        kmeans.fit(X)
+        start = time.perf_counter()
+        keys, X, computed = self.feature_store.features(posts, compute, clusterer.N_FEATURES)
+        elapsed = time.perf_counter() - start
 
-        return {
-            'clusters': kmeans.labels_.tolist(),
-            'centroids': kmeans.cluster_centers_.tolist()
-        }
+        reused = len(posts) - computed
+        if computed:
+            self.seconds_per_post = elapsed / computed
+        saved = f", ~{reused * self.seconds_per_post:.2f}s saved" if self.seconds_per_post else ''
+        self.logger.info(f"{category} features: {computed} posts scored in {elapsed:.2f}s, {reused} read from the store{saved}")
 
-    def generate_ai_insights(self, texts, category):
-        """Generate AI insights using Gemini with category-specific prompts"""
-        try:
-            prompts = {
-                'financial': PromptTemplate(
-                    input_variables=['texts'],
-                    template="""Analyze these financial market texts and provide:
-                    1. Current market sentiment and key financial trends
-                    2. Emerging investment opportunities
-                    3. Potential economic risks and challenges
-                    4. Sector-specific insights
-                    5. Short-term and long-term market outlook
-                    
-                    Detailed Financial Texts: {texts}
-                    
-                    Analyze data (quantitative or qualitative) to identify patterns, trends, correlations, or themes. 
-                    Condense the insights into concise, actionable points or narratives, highlighting key takeaways for easy understanding and decision-making.
-                    Summarize in short
-                    """
-                ),
-                'crypto': PromptTemplate(
-                    input_variables=['texts'],
-                    template="""Analyze these cryptocurrency and blockchain texts and provide:
-                    1. Current cryptocurrency market trends
-                    2. Emerging blockchain technologies
-                    3. Regulatory landscape updates
-                    4. Potential investment strategies
-                    5. Market sentiment and volatility indicators
-                    
-                    Detailed Crypto Texts: {texts}
-                    
-                    Analyze data (quantitative or qualitative) to identify patterns, trends, correlations, or themes.
-                    Condense the insights into concise, actionable points or narratives, highlighting key takeaways for easy understanding and decision-making.
-                    Summarize in short
-                    """
-                ),
-                'tech': PromptTemplate(
-                    input_variables=['texts'],
-                    template="""Analyze these technology industry texts and provide:
-                    1. Cutting-edge technological innovations
-                    2. Emerging tech trends
-                    3. Potential disruptive technologies
-                    4. Industry investment opportunities
-                    5. Impact of recent technological developments
-                    
-                    Detailed Tech Texts: {texts}
-                    
-                    Analyze data (quantitative or qualitative) to identify patterns, trends, correlations, or themes.
-                    Condense the insights into concise, actionable points or narratives, highlighting key takeaways for easy understanding and decision-making.
-                    Summarize in short
-                    """
-                ),
-                'entertainment': PromptTemplate(
-                    input_variables=['texts'],
-                    template="""Analyze these entertainment industry texts and provide:
-                    1. Current entertainment trends
-                    2. Emerging content and media innovations
-                    3. Audience engagement insights
-                    4. Potential industry shifts
-                    5. Notable upcoming releases and developments
+        sentiments = {
+            'top_positive': self.feature_store.top_sentiment(keys, 'positive'),
+            'top_negative': self.feature_store.top_sentiment(keys, 'negative'),
+            'total_analyzed': len(posts)
+        }
+        return sentiments, X
+
+    def insight_prompt(self, standard_category):
+        """Per-category insights prompt built from INSIGHT_PROMPTS"""
+        spec = self.INSIGHT_PROMPTS.get(standard_category, self.INSIGHT_PROMPTS['tech'])
+        focus = '\n'.join(f"                    {i}. {item}" for i, item in enumerate(spec['focus'], 1))
+        return PromptTemplate(
+            input_variables=['texts'],
+            template=f"""Analyze these {spec['subject']} texts and provide:
+{focus}
                     
-                    Detailed Entertainment Texts: {texts}
+                    Detailed {spec['label']} Texts: {{texts}}
                     
                     Analyze data (quantitative or qualitative) to identify patterns, trends, correlations, or themes.
                     Condense the insights into concise, actionable points or narratives, highlighting key takeaways for easy understanding and decision-making.
                     Summarize in short
                     """
-                )
-            }
+        )
 
+    def generate_ai_insights(self, texts, category):
+        """Generate AI insights using Gemini with category-specific prompts"""
+        try:
             # Select the appropriate prompt based on category
             # Modified to handle variations in input and provide a fallback
             normalized_category = category.lower().strip()
 
-            # Mapping to handle potential variations
-            category_map = {
-                'finance': 'financial',
-                'crypto': 'crypto',
-                'cryptocurrency': 'crypto',
-                'tech': 'tech',
-                'technology': 'tech',
-                'entertainment': 'entertainment',
-                'media': 'entertainment'
-            }
-
             # Get the standardized category or fallback to a default
-            standard_category = category_map.get(normalized_category, 'tech')
+            standard_category = self.CATEGORY_MAP.get(normalized_category, 'tech')
 
             # Select prompt, with tech as the ultimate fallback
-            prompt = prompts.get(standard_category, prompts['tech'])
+            prompt = self.insight_prompt(standard_category)
 
             chain = LLMChain(llm=self.gemini_llm, prompt=prompt)
             result = chain.run(
@@ -192,47 +225,139 @@ class TrendAnalyzer:
             return str(result)
         except Exception as e:
             self.logger.error(f"AI insights generation error for {category}: {e}")
-            return f"Trending insights for {category}: Key developments observed"
+            return self.FALLBACK_INSIGHTS.format(category=category)
+
+    def generate_batched_insights(self, requests):
+        """
+        Insights and a post draft for several categories in one Gemini call.
+
+        ``requests`` maps category -> {'texts': [...], 'hashtags': '#A #B'}. Returns
+        category -> {'insights': ..., 'post': ...} for every category the response
+        answered properly; callers fall back to per-category calls for the rest.
+        """
+        sections = []
+        for category, request in requests.items():
+            standard_category = self.CATEGORY_MAP.get(category.lower().strip(), 'tech')
+            sections.append(
+                f"### {category}\n"
+                f"Focus: {'; '.join(self.INSIGHT_PROMPTS[standard_category]['focus'])}\n"
+                f"Hashtags: {request['hashtags']}\n"
+                f"Texts:\n" + '\n'.join(request['texts'][:10])
+            )
+
+        prompt = PromptTemplate(
+            input_variables=['sections', 'categories'],
+            template="""For each category section below, analyze the texts to identify patterns, trends, correlations, or themes in the listed focus areas.
+
+    {sections}
+
+    Respond with only a JSON object whose keys are exactly: {categories}.
+    Each value must be an object with two string fields:
+    - "insights": concise, actionable insights highlighting key takeaways, summarized in short
+    - "post": an engaging post under 500 characters that captures the key insights, uses the category's hashtags and emojis aggressively within the message, and does not use points or list formatting
+    """
+        )
 
-    def analyze_trend_data(self, category):
-        """Analyze trend data for a specific category"""
         try:
-            # Load trend data
+            chain = LLMChain(llm=self.gemini_llm, prompt=prompt)
+            result = str(chain.run({'sections': '\n\n'.join(sections), 'categories': ', '.join(requests)}))
+            # Models often wrap JSON in a markdown code fence
+            match = re.search(r'\{.*\}', result, re.DOTALL)
+            parsed = json.loads(match.group(0)) if match else {}
+        except Exception as e:
+            self.logger.error(f"Batched insights generation error: {e}")
+            return {}
+
+        drafts = {}
+        for category in requests:
+            entry = parsed.get(category) if isinstance(parsed, dict) else None
+            if (
+                isinstance(entry, dict)
+                and isinstance(entry.get('insights'), str) and entry['insights'].strip()
+                and isinstance(entry.get('post'), str) and entry['post'].strip()
+            ):
+                drafts[category] = {'insights': entry['insights'], 'post': entry['post']}
+            else:
+                self.logger.warning(f"Batched insights response has no usable entry for {category}")
+        return drafts
+
+    def prepare_trend_data(self, category, trend_data=None):
+        """
+        CPU stage: score sentiment and update topics for a category's trend data.
+
+        ``trend_data`` comes straight from the crawler when running in the daemon;
+        otherwise the crawler's trend file is read. Returns the analysis without AI
+        insights plus the post texts, or None when there is nothing to analyze.
+        """
+        if trend_data is None:
+            # Load trend data, streaming only the keys analysis needs
             filepath = os.path.join('data', 'trends', f'{category}_trends.json')
+            trend_data = store.read_trends(filepath)
 
-            with open(filepath, 'r', encoding='utf-8') as f:
-                trend_data = json.load(f)
+        # Extract texts from top posts
+        top_posts = trend_data['post_metrics']['top_posts']
+        texts = [post['text'] for post in top_posts]
 
-            # Extract texts from top posts
-            texts = [post['text'] for post in trend_data['post_metrics']['top_posts']]
+        if not texts:
+            self.logger.warning(f"No texts found for {category} trends")
+            return None
 
-            if not texts:
-                self.logger.warning(f"No texts found for {category} trends")
-                return None
+        # Perform analyses; posts already in the feature store are not scored again
+        sentiments, X = self.cached_features(category, top_posts)
+        topics = self._perform_topic_clustering(texts, category, X)
+
+        # Prepare trend analysis
+        trend_analysis = {
+            'category': category,
+            'topHashtags': trend_data.get('top_hashtags', []),
+            'post_metrics': trend_data.get('post_metrics', {}),
+            'sentiment_analysis': sentiments,
+            'topic_clusters': topics
+        }
+        return trend_analysis, texts
+
+    def is_fallback_insights(self, category, insights):
+        return insights == self.FALLBACK_INSIGHTS.format(category=category)
+
+    def reusable_insights(self, trend_analysis):
+        """Last published insights when the category's top posts barely changed, else None"""
+        category = trend_analysis['category']
+        # A baseline saved from a failed Gemini call is dropped, so the category gets real insights
+        if self.is_fallback_insights(category, self.change_detector.last_insights(category)):
+            self.change_detector.forget(category)
+        top_posts = trend_analysis['post_metrics'].get('top_posts', [])
+        return self.change_detector.reusable(category, top_posts)
+
+    def record_insights(self, trend_analysis, llm_seconds):
+        """Remember a published cycle's input and insights for later change checks"""
+        category = trend_analysis['category']
+        if self.is_fallback_insights(category, trend_analysis['ai_insights']):
+            self.logger.info(f"Not recording fallback insights for {category}; the next cycle calls Gemini again")
+            return
+        top_posts = trend_analysis['post_metrics'].get('top_posts', [])
+        self.change_detector.record(category, top_posts, trend_analysis['ai_insights'], llm_seconds)
+
+    def save_trend_analysis(self, trend_analysis):
+        """Write a finished analysis to analysis_results and return the poster's summary path"""
+        category = trend_analysis['category']
+        output_file = store.write(trend_analysis)
+
+        self.logger.info(f"Analysis completed for {category}")
+        return output_file
 
-            # Perform analyses
-            sentiments = self.advanced_sentiment_analysis(texts)
-            topics = self._perform_topic_clustering(texts)
+    def analyze_trend_data(self, category):
+        """Analyze trend data for a specific category"""
+        try:
+            prepared = self.prepare_trend_data(category)
+            if prepared is None:
+                return None
+            trend_analysis, texts = prepared
 
             # Generate AI insights (synchronous for now)
-            ai_insights = self.generate_ai_insights(texts, category)
-
-            # Prepare trend analysis
-            trend_analysis = {
-                'category': category,
-                'topHashtags': trend_data.get('top_hashtags', []),
-                'post_metrics': trend_data.get('post_metrics', {}),
-                'sentiment_analysis': sentiments,
-                'topic_clusters': topics,
-                'ai_insights': ai_insights
-            }
+            trend_analysis['ai_insights'] = self.generate_ai_insights(texts, category)
 
             # Save analysis result
-            output_file = os.path.join('analysis_results', f'{category}_trend_analysis.json')
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(trend_analysis, f, indent=2)
-
-            self.logger.info(f"Analysis completed for {category}")
+            self.save_trend_analysis(trend_analysis)
             return trend_analysis
 
         except Exception as e:
@@ -242,16 +367,25 @@ class TrendAnalyzer:
 
 
 class BlueskyPoster:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, models=None):
         """Initialize Bluesky Poster"""
         self.logger = logger or logging.getLogger(__name__)
+        self.models = models or registry
         self.client = Client()
-
-        # Initialize Gemini for post generation
-        self.gemini_llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            google_api_key=os.getenv('GEMINI_KEY')  # Replace with your API key
+        self.session_manager = SessionManager(
+            os.getenv('BLUESKY_HANDLE_'),
+            os.getenv('BLUESKY_PASSWORD_'),
+            os.path.join(os.path.dirname(__file__), '.sessions')
         )
+        self.logged_in = False
+        self.force_login = False
+
+        # Gemini for post generation, shared with the analyzer
+        self.models.register('gemini', load_gemini)
+
+    @property
+    def gemini_llm(self):
+        return self.models.get('gemini')
 
     def format_post(self, text, max_length=300):
         """Format post for Bluesky"""
@@ -288,47 +422,45 @@ class BlueskyPoster:
 
         return list(chunks)
 
+    def post_hashtags(self, category, top_hashtags):
+        """Up to two hashtags from the trend's top hashtags, or the category defaults"""
+        # Ensure hashtags are clean strings
+        safe_hashtags = []
+        for tag in top_hashtags:
+            # If tag is a dictionary, extract the hashtag name
+            if isinstance(tag, dict):
+                hashtag_name = tag.get('hashtag', '')
+                # Only add if it's a non-empty string
+                if hashtag_name:
+                    safe_hashtags.append(f'#{hashtag_name}')
+            # If tag is already a string, just ensure it starts with #
+            elif isinstance(tag, str):
+                safe_hashtags.append(f'#{tag}' if not tag.startswith('#') else tag)
+
+        # Limit to 2 hashtags
+        safe_hashtags = safe_hashtags[:2]
+
+        # Fallback hashtags if no safe hashtags found
+        default_hashtags = {
+            'financial': ['#Finance', '#Investment'],
+            'tech': ['#TechTrends', '#Innovation'],
+            'crypto': ['#Crypto', '#Blockchain'],
+            'entertainment': ['#EntertainmentNews', '#PopCulture']
+        }
+
+        # Use safe hashtags or default hashtags
+        hashtags = safe_hashtags if safe_hashtags else default_hashtags.get(category, ['#Trends'])
+        return ' '.join(hashtags)
+
     def generate_post(self, analysis_file):
         """Generate Bluesky post from trend analysis"""
         try:
-            with open(analysis_file, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
+            analysis_data = store.read_summary(analysis_file)
 
             category = analysis_data['category']
             insights = str(analysis_data.get('ai_insights', ''))
 
-            # Clean up hashtags
-            top_hashtags = analysis_data.get('topHashtags', [])
-
-            # Ensure hashtags are clean strings
-            safe_hashtags = []
-            for tag in top_hashtags:
-                # If tag is a dictionary, extract the hashtag name
-                if isinstance(tag, dict):
-                    hashtag_name = tag.get('hashtag', '')
-                    # Only add if it's a non-empty string
-                    if hashtag_name:
-                        safe_hashtags.append(f'#{hashtag_name}')
-                # If tag is already a string, just ensure it starts with #
-                elif isinstance(tag, str):
-                    safe_hashtags.append(f'#{tag}' if not tag.startswith('#') else tag)
-
-            # Limit to 2 hashtags
-            safe_hashtags = safe_hashtags[:2]
-
-            # Fallback hashtags if no safe hashtags found
-            default_hashtags = {
-                'financial': ['#Finance', '#Investment'],
-                'tech': ['#TechTrends', '#Innovation'],
-                'crypto': ['#Crypto', '#Blockchain'],
-                'entertainment': ['#EntertainmentNews', '#PopCulture']
-            }
-
-            # Use safe hashtags or default hashtags
-            hashtags = safe_hashtags if safe_hashtags else default_hashtags.get(category, ['#Trends'])
-            hashtag_string = ' '.join(hashtags)
-
-            # Rest of the method remains the same...
+            hashtag_string = self.post_hashtags(category, analysis_data.get('topHashtags', []))
 
             # Robust prompt template
             prompts = {
@@ -388,14 +520,20 @@ class BlueskyPoster:
             traceback.print_exc()
             return None
 
+    def ensure_logged_in(self):
+        """Log in once per poster, reusing the saved session across posts and restarts"""
+        if self.force_login or not self.logged_in:
+            self.session_manager.login_sync(self.client, force=self.force_login)
+            self.logged_in = True
+            self.force_login = False
+
     def post_to_bluesky(self, post):
         """Post to Bluesky"""
         if not post:
             return False
 
         try:
-
-            self.client.login(os.getenv('BLUESKY_HANDLE_'), os.getenv('BLUESKY_PASSWORD_'))
+            self.ensure_logged_in()
             previous_post_ref = None
             root_post = None
             parent_post = None
@@ -417,6 +555,9 @@ class BlueskyPoster:
         except Exception as e:
             self.logger.error(f"Bluesky posting failed: {e}")
             traceback.print_exc()
+            # Only a real auth failure forces a fresh login on the next post
+            if SessionManager.is_auth_error(e):
+                self.force_login = True
             return False
 
 
@@ -452,22 +593,9 @@ async def main():
     categories = ['finance', 'crypto', 'entertainment', 'tech']
 
     try:
-        # Analyze trends for each category
-        for category in categories:
-            # Analyze trend and save results
-            trend_analysis = trend_analyzer.analyze_trend_data(category)
-
-            if trend_analysis:
-                # Generate Bluesky post from analysis
-                analysis_file = os.path.join('analysis_results', f'{category}_trend_analysis.json')
-                post = bluesky_poster.generate_post(analysis_file)
-
-                # Post to Bluesky
-                if post:
-                    bluesky_poster.post_to_bluesky(post)
-
-                # Add a small delay between posts
-                await asyncio.sleep(2)
+        # Analyze and post all categories concurrently
+        with make_cpu_pool(categories) as cpu_pool:
+            await run_analysis_cycle(trend_analyzer, bluesky_poster, categories, cpu_pool)
 
     except Exception as e:
         logger.error(f"Workflow error: {e}")
@@ -543,34 +671,24 @@ async def run_workflow_periodically():
     logger = setup_logging()
     logger.info("Starting periodic Trend Analysis and Bluesky Poster...")
 
-    while True:
-        try:
-            # Initialize components
-            trend_analyzer = TrendAnalyzer(logger)
-            bluesky_poster = BlueskyPoster(logger)
-
-            # Categories to process
-            categories = ['finance', 'crypto', 'entertainment', 'tech']
-
-            # Analyze trends for each category
-            for category in categories:
-                # Analyze trend and save results
-                trend_analysis = trend_analyzer.analyze_trend_data(category)
-
-                if trend_analysis:
-                    # Generate Bluesky post from analysis
-                    analysis_file = os.path.join('analysis_results', f'{category}_trend_analysis.json')
-                    post = bluesky_poster.generate_post(analysis_file)
+    # Components and their models live for the whole process
+    trend_analyzer = TrendAnalyzer(logger)
+    bluesky_poster = BlueskyPoster(logger)
 
-                    # Post to Bluesky
-                    if post:
-                        bluesky_poster.post_to_bluesky(post)
+    # Categories to process
+    categories = ['finance', 'crypto', 'entertainment', 'tech']
+    cpu_pool = make_cpu_pool(categories)
 
-                    # Add a small delay between posts
-                    await asyncio.sleep(2)
+    while True:
+        try:
+            # Analyze and post all categories concurrently; one category failing leaves the rest running
+            await run_analysis_cycle(trend_analyzer, bluesky_poster, categories, cpu_pool)
 
             # Log the completion of a workflow cycle
             logger.info("Workflow cycle completed. Waiting for next cycle...")
+            registry.unload_idle()
+            logger.info(f"Models: {registry.report()}")
+            logger.info(f"Insight reuse: {trend_analyzer.change_detector.report()}")
 
             # Wait for 10 minutes before next run
             await asyncio.sleep(30 * 60)  # 600 seconds = 10 minutes
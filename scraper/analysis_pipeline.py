@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from analysis_store import store
+
+logger = logging.getLogger(__name__)
+
+
+def make_cpu_pool(categories: List[str]) -> ThreadPoolExecutor:
+    """
+    Pool for the CPU stage (sentiment and clustering), sized to the host.
+
+    Threads rather than processes: the models live once in the shared registry.
+    Sentiment scoring is serialized by the scorer itself, so categories overlap
+    only in clustering, the feature store and file I/O.
+    """
+    workers = int(os.getenv('ANALYSIS_CPU_WORKERS', min(len(categories), os.cpu_count() or 1)))
+    return ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='analysis-cpu')
+
+
+def new_llm_stats() -> Dict[str, float]:
+    return {'round_trips': 0, 'seconds': 0.0}
+
+
+async def _timed_llm_call(llm_stats: Dict[str, float], fn, *args):
+    start = time.perf_counter()
+    try:
+        return await asyncio.to_thread(fn, *args)
+    finally:
+        llm_stats['round_trips'] += 1
+        llm_stats['seconds'] += time.perf_counter() - start
+
+
+async def publish(analyzer, poster, trend_analysis, post, llm_seconds: float, post_lock: asyncio.Lock, post_delay: float):
+    """Post one at a time under post_lock; only a published cycle becomes the insight baseline"""
+    if not post:
+        return
+    async with post_lock:
+        posted = await asyncio.to_thread(poster.post_to_bluesky, post)
+        await asyncio.sleep(post_delay)
+    # A failed post is retried next cycle instead of being skipped as unchanged
+    if posted:
+        analyzer.record_insights(trend_analysis, llm_seconds)
+
+
+async def generate_and_post(analyzer, poster, trend_analysis, texts, post_lock: asyncio.Lock, post_delay: float,
+                            llm_stats: Dict[str, float]):
+    """Per-category LLM stages: insights, save, post drafting and publishing"""
+    category = trend_analysis['category']
+    before = llm_stats['seconds']
+    trend_analysis['ai_insights'] = await _timed_llm_call(llm_stats, analyzer.generate_ai_insights, texts, category)
+    analysis_file = await asyncio.to_thread(analyzer.save_trend_analysis, trend_analysis)
+    post = await _timed_llm_call(llm_stats, poster.generate_post, analysis_file)
+    await publish(analyzer, poster, trend_analysis, post, llm_stats['seconds'] - before, post_lock, post_delay)
+
+
+async def analyze_and_post(
+    analyzer,
+    poster,
+    category: str,
+    cpu_pool: Executor,
+    post_lock: asyncio.Lock,
+    post_delay: float = 2,
+    trend_data: Optional[Dict[str, Any]] = None,
+    force: bool = False,
+    llm_stats: Optional[Dict[str, float]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Run one category through analysis and posting.
+
+    The CPU stage runs on ``cpu_pool``; the Gemini and posting stages run in
+    threads so other categories keep moving. When the category's top posts
+    barely changed since its last post, the previous insights are reused and the
+    Gemini calls and repost are skipped, unless ``force`` is set. Posts go out
+    one at a time under ``post_lock`` with ``post_delay`` between them. Errors
+    are logged and return None, so one category cannot stop the others.
+    """
+    loop = asyncio.get_running_loop()
+    llm_stats = llm_stats if llm_stats is not None else new_llm_stats()
+    try:
+        prepared = await loop.run_in_executor(cpu_pool, analyzer.prepare_trend_data, category, trend_data)
+        if prepared is None:
+            return None
+        trend_analysis, texts = prepared
+
+        insights = None if force else analyzer.reusable_insights(trend_analysis)
+        if insights is not None:
+            trend_analysis['ai_insights'] = insights
+            await asyncio.to_thread(analyzer.save_trend_analysis, trend_analysis)
+            return trend_analysis
+
+        await generate_and_post(analyzer, poster, trend_analysis, texts, post_lock, post_delay, llm_stats)
+        return trend_analysis
+    except Exception as e:
+        logger.error(f"Analysis pipeline failed for {category}: {e}", exc_info=True)
+        return None
+
+
+async def _run_batched(analyzer, poster, categories, cpu_pool, post_lock, post_delay, llm_stats):
+    """CPU stages in parallel, then one Gemini call for every category that needs new insights"""
+    loop = asyncio.get_running_loop()
+
+    async def prepare(category):
+        try:
+            return await loop.run_in_executor(cpu_pool, analyzer.prepare_trend_data, category, None)
+        except Exception as e:
+            logger.error(f"Analysis pipeline failed for {category}: {e}", exc_info=True)
+            return None
+
+    results = {}
+    pending = {}
+    for category, prepared in zip(categories, await asyncio.gather(*[prepare(category) for category in categories])):
+        results[category] = None
+        if prepared is None:
+            continue
+        trend_analysis, texts = prepared
+        insights = analyzer.reusable_insights(trend_analysis)
+        if insights is None:
+            pending[category] = prepared
+            continue
+        trend_analysis['ai_insights'] = insights
+        try:
+            await asyncio.to_thread(analyzer.save_trend_analysis, trend_analysis)
+            results[category] = trend_analysis
+        except Exception as e:
+            logger.error(f"Analysis pipeline failed for {category}: {e}", exc_info=True)
+
+    drafts = {}
+    batch_seconds = 0.0
+    if pending:
+        requests = {
+            category: {'texts': texts, 'hashtags': poster.post_hashtags(category, trend_analysis.get('topHashtags', []))}
+            for category, (trend_analysis, texts) in pending.items()
+        }
+        drafts = await _timed_llm_call(llm_stats, analyzer.generate_batched_insights, requests)
+        batch_seconds = llm_stats['seconds']
+
+    async def finish(category, trend_analysis, texts):
+        try:
+            if category not in drafts:
+                # Per-category fallback for anything the batched response did not answer
+                await generate_and_post(analyzer, poster, trend_analysis, texts, post_lock, post_delay, llm_stats)
+                return trend_analysis
+            trend_analysis['ai_insights'] = drafts[category]['insights']
+            await asyncio.to_thread(analyzer.save_trend_analysis, trend_analysis)
+            post = poster.split_content_into_chunks(drafts[category]['post'])
+            await publish(analyzer, poster, trend_analysis, post, batch_seconds / len(pending), post_lock, post_delay)
+            return trend_analysis
+        except Exception as e:
+            logger.error(f"Analysis pipeline failed for {category}: {e}", exc_info=True)
+            return None
+
+    finished = await asyncio.gather(*[finish(category, *prepared) for category, prepared in pending.items()])
+    results.update(zip(pending, finished))
+    return results
+
+
+async def run_analysis_cycle(
+    analyzer,
+    poster,
+    categories: List[str],
+    cpu_pool: Executor,
+    post_delay: float = 2,
+    batched: Optional[bool] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Analyze and post every category concurrently from the trend files on disk.
+
+    By default each category is its own analyze_and_post task, so one category's
+    inference overlaps another's LLM wait. With INSIGHTS_MODE=batched all
+    categories needing new insights share one Gemini call that also drafts their
+    posts, with per-category calls as the fallback; it makes fewer round trips
+    but starts only once every CPU stage is done. LLM round trips and time, and analysis bytes read and written, are
+    logged per cycle.
+    """
+    if batched is None:
+        batched = os.getenv('INSIGHTS_MODE', 'per_category').lower() == 'batched'
+    post_lock = asyncio.Lock()
+    llm_stats = new_llm_stats()
+    store.take_stats()
+
+    start = time.perf_counter()
+    if batched:
+        results = await _run_batched(analyzer, poster, categories, cpu_pool, post_lock, post_delay, llm_stats)
+    else:
+        results = dict(zip(categories, await asyncio.gather(*[
+            analyze_and_post(analyzer, poster, category, cpu_pool, post_lock, post_delay, llm_stats=llm_stats)
+            for category in categories
+        ])))
+    io = store.take_stats()
+    logger.info(
+        f"Analysis cycle for {len(categories)} categories took {time.perf_counter() - start:.1f}s: "
+        f"{llm_stats['round_trips']} LLM round trips, {llm_stats['seconds']:.1f}s in LLM calls, "
+        f"{io['bytes_read'] / 1024:.1f} KB read, {io['bytes_written'] / 1024:.1f} KB written"
+    )
+    return results
@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Top-level keys of a crawler trend file that analysis uses; hashtag_windows is skipped
+TREND_KEYS = ('top_hashtags', 'post_metrics')
+
+
+class AnalysisStore:
+    """
+    Reads crawler trend files and writes analysis results.
+
+    Each analysis is split in two: a small JSON summary with what the poster
+    needs (category, insights, hashtags and headline numbers) and a gzip
+    compressed JSON artifact with the bulk data (post metrics, per-post
+    sentiment and cluster labels). Streaming trend files needs ijson, which is
+    optional: with it only the keys analysis uses are built, without it the file
+    is read with plain json.load. Bytes read and written are counted until the
+    next ``take_stats``.
+    """
+
+    SUMMARY_HASHTAGS = 5
+
+    def __init__(self, root: str = 'analysis_results'):
+        self.root = root
+        self.lock = threading.Lock()
+        self.stats = {'bytes_read': 0, 'bytes_written': 0}
+
+    def _count(self, key: str, size: int):
+        with self.lock:
+            self.stats[key] += size
+
+    def take_stats(self) -> Dict[str, int]:
+        """Bytes read and written since the last call"""
+        with self.lock:
+            stats, self.stats = self.stats, {'bytes_read': 0, 'bytes_written': 0}
+        return stats
+
+    def read_trends(self, path: str, keys: Iterable[str] = TREND_KEYS) -> Dict[str, Any]:
+        """The given top-level keys of a trend file; streamed only when ijson is installed"""
+        keys = set(keys)
+        if ijson is None:
+            # Plain json.load: the whole file is parsed, other keys are dropped afterwards
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key in [key for key in data if key not in keys]:
+                del data[key]
+            self._count('bytes_read', os.path.getsize(path))
+            return data
+
+        with open(path, 'rb') as f:
+            data = self._stream_keys(f, keys)
+            self._count('bytes_read', f.tell())
+        return data
+
+    @staticmethod
+    def _stream_keys(f, keys) -> Dict[str, Any]:
+        data = {}
+        builder = key = None
+        for prefix, event, value in ijson.parse(f, buf_size=8192, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if not builder.containers:
+                    data[key] = builder.value
+                    builder = None
+            elif prefix in keys:
+                if event in ('start_map', 'start_array'):
+                    builder, key = ijson.ObjectBuilder(), prefix
+                    builder.event(event, value)
+                elif event != 'map_key':
+                    data[prefix] = value
+        return data
+
+    def _paths(self, category: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, f'{category}_trend_analysis')
+        return f'{base}.json', f'{base}.bulk.json.gz'
+
+    def write(self, trend_analysis: Dict[str, Any]) -> str:
+        """Write the summary and bulk artifact for an analysis; returns the summary path"""
+        category = trend_analysis['category']
+        summary_path, bulk_path = self._paths(category)
+        post_metrics = trend_analysis.get('post_metrics', {})
+        topics = trend_analysis.get('topic_clusters', {})
+
+        summary = {
+            'category': category,
+            'ai_insights': trend_analysis.get('ai_insights', ''),
+            'topHashtags': trend_analysis.get('topHashtags', [])[:self.SUMMARY_HASHTAGS],
+            'total_posts': post_metrics.get('total_posts', 0),
+            'average_likes': post_metrics.get('average_likes', 0),
+            'topics': [topic['top_terms'] for topic in topics.get('topics', [])],
+            'bulk': os.path.basename(bulk_path)
+        }
+        bulk = {
+            'category': category,
+            'post_metrics': post_metrics,
+            'sentiment_analysis': trend_analysis.get('sentiment_analysis', {}),
+            'topic_clusters': topics
+        }
+
+        os.makedirs(self.root, exist_ok=True)
+        # Bulk first, so a summary never points at a missing or older artifact
+        written = self._replace(bulk_path, gzip.compress(json.dumps(bulk, separators=(',', ':')).encode('utf-8'), 6))
+        written += self._replace(summary_path, json.dumps(summary, indent=2).encode('utf-8'))
+        self._count('bytes_written', written)
+        return summary_path
+
+    @staticmethod
+    def _replace(path: str, data: bytes) -> int:
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(f'{path}.tmp', path)
+        return len(data)
+
+    def read_summary(self, path: str) -> Dict[str, Any]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        self._count('bytes_read', len(data))
+        return json.loads(data)
+
+    def read_bulk(self, category: str) -> Dict[str, Any]:
+        with open(self._paths(category)[1], 'rb') as f:
+            data = f.read()
+        self._count('bytes_read', len(data))
+        return json.loads(gzip.decompress(data))
+
+
+store = AnalysisStore(os.getenv('ANALYSIS_RESULTS_DIR', 'analysis_results'))
@@ -0,0 +1,144 @@
+"""
+Bytes written and read per analysis cycle: one pretty-printed analysis file
+holding everything (with dense KMeans centroids) vs AnalysisStore's summary
+plus compressed bulk artifact.
+
+Trend files are synthetic but shaped like the crawler's: 50 top posts, 20 top
+hashtags and the three hashtag windows. Also reports peak memory of reading a
+trend file with json.load vs read_trends, which streams only when ijson is
+installed (pip install ijson) and otherwise is plain json.load.
+
+    python benchmarks/bench_analysis_output.py [--categories 4]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analysis_store  # noqa: E402
+from analysis_store import AnalysisStore  # noqa: E402
+
+_rng = random.Random(3)
+WORDS = [''.join(_rng.choices(string.ascii_lowercase, k=_rng.randint(3, 9))) for _ in range(3000)]
+
+
+def make_trend_file(path, rng):
+    hashtags = [rng.choice(WORDS) for _ in range(20)]
+    posts = [
+        {
+            'uri': f'at://did:plc:{rng.getrandbits(64):x}/app.bsky.feed.post/{rng.getrandbits(48):x}',
+            'text': ' '.join(rng.choice(WORDS) for _ in range(40)) + ' #' + rng.choice(hashtags),
+            'created_at': '2024-11-20T10:15:00+00:00',
+            'likes': rng.randint(0, 5000),
+            'hashtags': [rng.choice(hashtags)]
+        }
+        for _ in range(50)
+    ]
+    windows = {
+        window: [{'hashtag': rng.choice(WORDS), 'count': rng.randint(1, 500), 'max_error': 0} for _ in range(20)]
+        for window in ('15m', '1h', '24h')
+    }
+    data = {
+        'top_hashtags': [{'hashtag': tag, 'count': rng.randint(1, 200), 'percentage': 1.5} for tag in hashtags],
+        'hashtag_windows': windows,
+        'post_metrics': {'total_posts': 800, 'average_likes': 42.5, 'top_posts': posts}
+    }
+    with open(path, 'w') as f:
+        f.write(json.dumps(data, indent=2))
+
+
+def make_analysis(category, trend_data, rng):
+    posts = trend_data['post_metrics']['top_posts']
+    sentiment = [{'text': post['text'], 'sentiment': 'positive', 'confidence': 0.9} for post in posts[:5]]
+    return {
+        'category': category,
+        'topHashtags': trend_data['top_hashtags'],
+        'post_metrics': trend_data['post_metrics'],
+        'sentiment_analysis': {'top_positive': sentiment, 'top_negative': sentiment, 'total_analyzed': len(posts)},
+        'topic_clusters': {
+            'clusters': [rng.randrange(3) for _ in posts],
+            'topics': [{'id': i, 'size': 17, 'top_terms': rng.sample(WORDS, 10)} for i in range(3)]
+        },
+        'ai_insights': ' '.join(rng.choice(WORDS) for _ in range(150))
+    }
+
+
+def single_file_cycle(root, trend_paths, rng):
+    """The previous layout: json.load the trend file, dump everything, poster re-reads it all"""
+    read = written = 0
+    for category, path in trend_paths.items():
+        with open(path, 'r', encoding='utf-8') as f:
+            trend_data = json.load(f)
+        read += os.path.getsize(path)
+
+        analysis = make_analysis(category, trend_data, rng)
+        analysis['topic_clusters']['centroids'] = [[rng.random() for _ in range(1000)] for _ in range(3)]
+        output = os.path.join(root, f'{category}_trend_analysis.json')
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(analysis, f, indent=2)
+        written += os.path.getsize(output)
+
+        with open(output, 'r', encoding='utf-8') as f:
+            json.load(f)
+        read += os.path.getsize(output)
+    return read, written
+
+
+def split_cycle(store, trend_paths, rng):
+    store.take_stats()
+    for category, path in trend_paths.items():
+        trend_data = store.read_trends(path)
+        store.read_summary(store.write(make_analysis(category, trend_data, rng)))
+    stats = store.take_stats()
+    return stats['bytes_read'], stats['bytes_written']
+
+
+def json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def peak_read_memory(path, read):
+    tracemalloc.start()
+    read(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--categories', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as root:
+        trend_paths = {}
+        for i in range(args.categories):
+            trend_paths[f'category{i}'] = os.path.join(root, f'category{i}_trends.json')
+            make_trend_file(trend_paths[f'category{i}'], rng)
+
+        old_root = os.path.join(root, 'old')
+        os.makedirs(old_root)
+        old_read, old_written = single_file_cycle(old_root, trend_paths, rng)
+        new_read, new_written = split_cycle(AnalysisStore(os.path.join(root, 'new')), trend_paths, rng)
+
+        path = next(iter(trend_paths.values()))
+        json_peak = peak_read_memory(path, json_load)
+        stream_peak = peak_read_memory(path, AnalysisStore(root).read_trends)
+
+    print(f'{args.categories} categories per cycle')
+    print(f'single file        {old_written / 1024:8.1f} KB written  {old_read / 1024:8.1f} KB read')
+    print(f'summary + bulk     {new_written / 1024:8.1f} KB written  {new_read / 1024:8.1f} KB read')
+    reader = 'ijson' if analysis_store.ijson is not None else 'json.load fallback, ijson not installed'
+    print(f'trend file read peak memory: json.load {json_peak / 1024:.1f} KB, read_trends {stream_peak / 1024:.1f} KB ({reader})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Cycle time for four categories: the old sequential loop vs run_analysis_cycle,
+with per-category and batched Gemini calls.
+
+Stages are stand-ins with the shape of the real ones: the CPU stage hashes
+buffers (which releases the GIL, like torch and scikit-learn), with the
+sentiment share of it serialized as SentimentScorer does, and the Gemini
+and posting stages sleep for typical latencies. The batched call sleeps
+--batch-factor times one call, for its longer prompt and response.
+
+    python benchmarks/bench_analysis_pipeline.py [--cpu-seconds 2] [--llm-seconds 3] [--batch-factor 1.5]
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_pipeline import make_cpu_pool, run_analysis_cycle  # noqa: E402
+
+CATEGORIES = ['finance', 'crypto', 'entertainment', 'tech']
+BUFFER = os.urandom(8 * 2**20)
+
+
+class StageAnalyzer:
+    def __init__(self, cpu_seconds, llm_seconds, batch_factor, sentiment_share):
+        self.cpu_seconds = cpu_seconds
+        self.llm_seconds = llm_seconds
+        self.batch_factor = batch_factor
+        self.sentiment_share = sentiment_share
+        self.llm_calls = 0
+        # SentimentScorer serializes its calls, so that share of the CPU stage never overlaps
+        self.sentiment_lock = threading.Lock()
+
+    @staticmethod
+    def burn(seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            hashlib.sha256(BUFFER).digest()
+
+    def prepare_trend_data(self, category, trend_data=None):
+        with self.sentiment_lock:
+            self.burn(self.cpu_seconds * self.sentiment_share)
+        self.burn(self.cpu_seconds * (1 - self.sentiment_share))
+        return {'category': category}, ['text']
+
+    def generate_ai_insights(self, texts, category):
+        self.llm_calls += 1
+        time.sleep(self.llm_seconds)
+        return 'insights'
+
+    def generate_batched_insights(self, requests):
+        self.llm_calls += 1
+        time.sleep(self.llm_seconds * self.batch_factor)
+        return {category: {'insights': 'insights', 'post': 'post'} for category in requests}
+
+    def reusable_insights(self, trend_analysis):
+        return None
+
+    def record_insights(self, trend_analysis, llm_seconds):
+        pass
+
+    def save_trend_analysis(self, trend_analysis):
+        return f"{trend_analysis['category']}_trend_analysis.json"
+
+
+class StagePoster:
+    def __init__(self, analyzer, llm_seconds, post_seconds):
+        self.analyzer = analyzer
+        self.llm_seconds = llm_seconds
+        self.post_seconds = post_seconds
+
+    def post_hashtags(self, category, top_hashtags):
+        return ''
+
+    def split_content_into_chunks(self, content):
+        return [content]
+
+    def generate_post(self, analysis_file):
+        self.analyzer.llm_calls += 1
+        time.sleep(self.llm_seconds)
+        return ['post']
+
+    def post_to_bluesky(self, post):
+        time.sleep(self.post_seconds)
+        return True
+
+
+async def sequential_cycle(analyzer, poster, post_delay):
+    for category in CATEGORIES:
+        trend_analysis, texts = analyzer.prepare_trend_data(category)
+        trend_analysis['ai_insights'] = analyzer.generate_ai_insights(texts, category)
+        analysis_file = analyzer.save_trend_analysis(trend_analysis)
+        poster.post_to_bluesky(poster.generate_post(analysis_file))
+        await asyncio.sleep(post_delay)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cpu-seconds', type=float, default=2.0)
+    parser.add_argument('--llm-seconds', type=float, default=3.0)
+    parser.add_argument('--post-seconds', type=float, default=0.5)
+    parser.add_argument('--post-delay', type=float, default=2.0)
+    parser.add_argument('--batch-factor', type=float, default=1.5)
+    parser.add_argument('--sentiment-share', type=float, default=0.75,
+                        help='Share of the CPU stage spent in (serialized) sentiment scoring')
+    args = parser.parse_args()
+
+    analyzer = StageAnalyzer(args.cpu_seconds, args.llm_seconds, args.batch_factor, args.sentiment_share)
+    poster = StagePoster(analyzer, args.llm_seconds, args.post_seconds)
+
+    start = time.perf_counter()
+    await sequential_cycle(analyzer, poster, args.post_delay)
+    sequential = time.perf_counter() - start
+    print(f'sequential loop         {sequential:6.1f}s per cycle, {analyzer.llm_calls} LLM round trips')
+
+    with make_cpu_pool(CATEGORIES) as cpu_pool:
+        for batched in (False, True):
+            analyzer.llm_calls = 0
+            start = time.perf_counter()
+            await run_analysis_cycle(analyzer, poster, CATEGORIES, cpu_pool, post_delay=args.post_delay, batched=batched)
+            elapsed = time.perf_counter() - start
+            label = 'batched' if batched else 'per-category'
+            print(f'run_analysis_cycle {label:<12} {elapsed:6.1f}s per cycle, {analyzer.llm_calls} LLM round trips '
+                  f'({sequential / elapsed:.1f}x faster)')
+        workers = cpu_pool._max_workers
+
+    print(f'{os.cpu_count()} cores, {workers} CPU-stage workers')
+
+if __name__ == '__main__':
+    asyncio.run(main())
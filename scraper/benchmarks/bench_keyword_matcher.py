@@ -0,0 +1,116 @@
+"""
+Categorization throughput at 1M posts: the old per-category substring scans, the
+previous per-post token matcher, and KeywordMatcher.match_many over the whole batch.
+
+    python benchmarks/bench_keyword_matcher.py [--posts 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+
+# Keyword-like words, including substring traps the old scans mis-tagged
+KEYWORDS = (
+    'stock stocks market markets trading livestock marketing financial economy report reports '
+    'investment strategy strategies crypto cryptocurrency bitcoin #stocks #crypto'
+).split()
+KEYWORD_RATE = 0.03
+
+
+def make_vocabulary():
+    random.seed(1)
+    filler = [''.join(random.choices(string.ascii_lowercase, k=random.randint(2, 9))) for _ in range(3000)]
+    return filler + ['the', 'a', 'to', 'of', 'and', 'in', 'is', '#ai', 'https://example.com/x', "it's", 'great!']
+
+
+def legacy_categorize(text):
+    categories = []
+    if any(keyword in text.lower() for keyword in ['stock', 'market', 'trading']):
+        categories.append('stock_updates')
+    if any(keyword in text.lower() for keyword in ['financial', 'economy', 'report']):
+        categories.append('financial_news')
+    if any(keyword in text.lower() for keyword in ['investment', 'strategy']):
+        categories.append('investment_insights')
+    if 'crypto' in text.lower():
+        categories.append('crypto_news')
+    return categories
+
+
+class TokenMatcher:
+    """The previous KeywordMatcher: per post, blank punctuation, split and intersect with keyword forms"""
+
+    PUNCTUATION = ''.join(char for char in string.punctuation if char != '_').encode()
+    BLANK_PUNCTUATION = bytes.maketrans(PUNCTUATION, b' ' * len(PUNCTUATION))
+
+    def __init__(self, table):
+        self.word_categories = {}
+        for category, keywords in table.items():
+            for keyword in keywords:
+                for suffix in ('', 's', 'es'):
+                    self.word_categories.setdefault((keyword.lower() + suffix).encode(), set()).add(category)
+        self.words = frozenset(self.word_categories)
+
+    def match(self, text):
+        tokens = text.lower().encode('utf-8').translate(self.BLANK_PUNCTUATION).split()
+        matched = set()
+        for word in self.words.intersection(tokens):
+            matched |= self.word_categories[word]
+        return matched
+
+
+def make_posts(n):
+    """Posts of 10-50 words where about 3% of words are keywords or near-misses"""
+    vocabulary = make_vocabulary()
+    random.seed(42)
+    posts = []
+    for _ in range(n):
+        words = [
+            random.choice(KEYWORDS) if random.random() < KEYWORD_RATE else random.choice(vocabulary)
+            for _ in range(random.randint(10, 50))
+        ]
+        posts.append(' '.join(words).capitalize())
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with open(os.path.join(SCRAPER_DIR, 'config.json'), 'r', encoding='utf-8') as f:
+        table = json.load(f)['category_keywords']
+    matcher = KeywordMatcher(table)
+    token_matcher = TokenMatcher(table)
+
+    posts = make_posts(args.posts)
+
+    start = time.perf_counter()
+    legacy = [legacy_categorize(text) for text in posts]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tokens = [token_matcher.match(text) for text in posts]
+    token_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = matcher.match_many(posts)
+    matcher_time = time.perf_counter() - start
+
+    assert all(a == b for a, b in zip(tokens, matched)), 'match_many disagrees with the token matcher'
+    differing = sum(1 for a, b in zip(legacy, matched) if set(a) != b)
+    print(f'{args.posts:,} posts')
+    print(f'legacy substring scans     {legacy_time:7.2f}s  {args.posts / legacy_time:12,.0f} posts/s')
+    print(f'previous token matcher     {token_time:7.2f}s  {args.posts / token_time:12,.0f} posts/s')
+    print(f'KeywordMatcher.match_many  {matcher_time:7.2f}s  {args.posts / matcher_time:12,.0f} posts/s')
+    print(f'posts the legacy scans tagged differently: {differing:,}')
+
+if __name__ == '__main__':
+    main()
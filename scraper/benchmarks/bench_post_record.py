@@ -0,0 +1,83 @@
+"""
+Resident memory at 1M posts: the old per-post dicts vs PostRecord.
+
+Each variant runs in a fresh interpreter so peak RSS is not shared.
+
+    python benchmarks/bench_post_record.py [--posts 1000000]
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from post_record import PostRecord  # noqa: E402
+
+HASHTAGS = ['stocks', 'crypto', 'ai', 'finance', 'bitcoin', 'markets', 'tech', 'web3']
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def api_values(n):
+    """Yield the values search_posts receives, with fresh strings per post as from JSON"""
+    random.seed(7)
+    now = datetime.now(timezone.utc)
+    for i in range(n):
+        yield (
+            f'at://did:plc:user{i % 50_000}/app.bsky.feed.post/{i:013d}',
+            f'Post {i} about markets ' + 'lorem ipsum ' * random.randint(2, 12),
+            (now - timedelta(seconds=random.randint(0, 7200))).isoformat().replace('+00:00', 'Z'),
+            random.randint(0, 500),
+            # New string objects per post, as decoded from each API response
+            [''.join(tag) for tag in random.sample(HASHTAGS, random.randint(0, 3))]
+        )
+
+
+def run_variant(variant, n):
+    baseline = peak_rss_mb()
+    if variant == 'dict':
+        posts = [
+            {'uri': uri, 'text': text, 'created_at': created_at, 'likes': likes, 'hashtags': hashtags}
+            for uri, text, created_at, likes, hashtags in api_values(n)
+        ]
+    else:
+        posts = [PostRecord.create(*values) for values in api_values(n)]
+    # The pipeline keeps each post in a category list and a trend top-post list as well
+    copies = [list(posts), list(posts)]
+    print(f'{peak_rss_mb() - baseline:.0f}')
+    return copies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--variant', choices=['dict', 'record'])
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.posts)
+        return
+
+    results = {}
+    for variant in ('dict', 'record'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--variant', variant, '--posts', str(args.posts)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results[variant] = float(output.strip())
+
+    print(f'{args.posts:,} posts, each held in three lists')
+    print(f'dict per post     {results["dict"]:8.0f} MB peak RSS growth')
+    print(f'PostRecord        {results["record"]:8.0f} MB peak RSS growth '
+          f'({(1 - results["record"] / results["dict"]) * 100:.0f}% less)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Write and read throughput: PostStore vs the old per-category latest.json rewrites.
+
+    python benchmarks/bench_post_store.py [--zstd]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from post_store import PostStore  # noqa: E402
+
+CATEGORIES = ['stock_updates', 'financial_news', 'investment_insights', 'crypto_news']
+CYCLES = 12
+POSTS_PER_CATEGORY = 2000
+
+
+def make_posts(cycle, now):
+    random.seed(cycle)
+    posts = {}
+    for category in CATEGORIES:
+        posts[category] = [
+            {
+                'uri': f'at://did:plc:user{random.randint(0, 10**6)}/app.bsky.feed.post/{cycle}-{category}-{i}',
+                'text': f'Markets moved on {category} news #stocks #finance ' + 'lorem ipsum ' * random.randint(2, 20),
+                'created_at': (now - timedelta(seconds=random.randint(0, 7200))).isoformat(),
+                'likes': random.randint(0, 500),
+                'hashtags': ['stocks', 'finance']
+            }
+            for i in range(POSTS_PER_CATEGORY)
+        ]
+    return posts
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def bench_legacy(root, cycles):
+    write_time = read_time = 0.0
+    for posts in cycles:
+        start = time.perf_counter()
+        for category, data in posts.items():
+            path = os.path.join(root, category, 'latest.json')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(json.dumps(data, indent=2))
+        write_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for category in CATEGORIES:
+            with open(os.path.join(root, category, 'latest.json')) as f:
+                json.load(f)
+        read_time += time.perf_counter() - start
+    return write_time, read_time
+
+
+def bench_store(root, cycles, now, compress):
+    store = PostStore(root, compress=compress)
+    write_time = read_time = 0.0
+    records_read = 0
+    for posts in cycles:
+        start = time.perf_counter()
+        for category, data in posts.items():
+            store.append(category, data)
+        write_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for category in CATEGORIES:
+            records_read += len(store.load_range(category, now - timedelta(hours=2), now + timedelta(seconds=1)))
+        read_time += time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.compact(older_than=timedelta(0))
+    compact_time = time.perf_counter() - start
+    return write_time, read_time, compact_time, records_read
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--zstd', action='store_true', help='Compress store parts with zstd')
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    cycles = [make_posts(cycle, now) for cycle in range(CYCLES)]
+    total = CYCLES * len(CATEGORIES) * POSTS_PER_CATEGORY
+
+    root = tempfile.mkdtemp()
+    try:
+        legacy_write, legacy_read = bench_legacy(os.path.join(root, 'legacy'), cycles)
+        store_write, store_read, compact, records_read = bench_store(os.path.join(root, 'store'), cycles, now, args.zstd)
+
+        print(f'{total:,} posts over {CYCLES} cycles')
+        print(f'legacy latest.json  write {total / legacy_write:10,.0f} posts/s   '
+              f'read {total / legacy_read:10,.0f} posts/s   on disk {dir_size(os.path.join(root, "legacy")):>11,} B '
+              f'(last cycle only)')
+        print(f'PostStore           write {total / store_write:10,.0f} posts/s   '
+              f'read {records_read / store_read:10,.0f} posts/s   on disk {dir_size(os.path.join(root, "store")):>11,} B '
+              f'(full history, compaction {compact * 1000:.0f} ms)')
+        print(f'store reads return the whole 2h window each cycle: {records_read:,} records read in total')
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Search fan-out under a local stub that enforces a concurrency cap and a request rate.
+
+Compares the old unbounded asyncio.gather (errors become empty results) against
+the AIMD controller the crawler now uses.
+
+    python benchmarks/bench_search_fanout.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrency import AIMDController  # noqa: E402
+
+SEARCHES = 200
+POSTS_PER_PAGE = 100
+
+
+class StubResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class StubRateLimitError(Exception):
+    def __init__(self):
+        super().__init__('429 RateLimitExceeded')
+        self.response = StubResponse(429)
+
+
+class RateLimitedSearchStub:
+    """Answers searches like the AppView would, rejecting with 429 beyond its limits"""
+
+    def __init__(self, max_concurrent=6, rate_per_second=60, latency=0.05):
+        self.max_concurrent = max_concurrent
+        self.rate = rate_per_second
+        self.latency = latency
+        self.in_flight = 0
+        self.tokens = float(rate_per_second)
+        self.last_refill = time.monotonic()
+
+    def _take_token(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def search_posts(self, params):
+        if self.in_flight >= self.max_concurrent or not self._take_token():
+            await asyncio.sleep(self.latency / 5)
+            raise StubRateLimitError()
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency)
+            return [{'text': f"{params['q']} post {i}"} for i in range(POSTS_PER_PAGE)]
+        finally:
+            self.in_flight -= 1
+
+
+async def run_unbounded(stub):
+    async def search(term):
+        try:
+            return await stub.search_posts({'q': term})
+        except Exception:
+            return []
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[search(f'term{i}') for i in range(SEARCHES)])
+    elapsed = time.perf_counter() - start
+    posts = sum(len(r) for r in results)
+    failed = sum(1 for r in results if not r)
+    print(f'unbounded gather  {posts / elapsed:10,.0f} posts/s  {failed / SEARCHES:6.1%} searches empty  '
+          f'{elapsed:6.2f}s')
+
+
+async def run_aimd(stub):
+    controller = AIMDController(initial=4, maximum=16, base_delay=0.05, max_delay=1.0, retries=8)
+
+    async def search(term):
+        try:
+            return await controller.call(stub.search_posts, {'q': term})
+        except Exception:
+            return []
+
+    results = await asyncio.gather(*[search(f'term{i}') for i in range(SEARCHES)])
+    posts = sum(len(r) for r in results)
+    failed = sum(1 for r in results if not r)
+    print(f'AIMD controller   {controller.report(posts)}, {failed / SEARCHES:.1%} searches empty')
+
+
+async def main():
+    await run_unbounded(RateLimitedSearchStub())
+    await run_aimd(RateLimitedSearchStub())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
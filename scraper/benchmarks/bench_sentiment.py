@@ -0,0 +1,72 @@
+"""
+FinBERT throughput: the old per-post pipeline call vs SentimentScorer at batch sizes 1/8/32.
+
+Needs torch, transformers and the ProsusAI/finbert weights.
+
+    python benchmarks/bench_sentiment.py [--posts 200] [--max-length 128]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformers import pipeline  # noqa: E402
+
+from sentiment import SentimentScorer  # noqa: E402
+
+PHRASES = [
+    'Stocks rallied after the earnings beat', 'Bitcoin slid as regulators weighed new rules',
+    'The central bank kept rates on hold', 'Revenue guidance disappointed analysts',
+    'Investors rotated into defensive sectors', 'The startup raised a large series B',
+    'Bond yields climbed to a yearly high', 'Layoffs hit the tech sector again',
+]
+
+
+def make_posts(n):
+    """Posts from a few words up to Bluesky's 300 characters, as in trend top posts"""
+    random.seed(3)
+    posts = []
+    for _ in range(n):
+        text = ''
+        target = random.choice([40, 80, 150, 300])
+        while len(text) < target:
+            text += random.choice(PHRASES) + '. '
+        posts.append(text[:300])
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--max-length', type=int, default=128)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+
+    legacy = pipeline('sentiment-analysis', model='ProsusAI/finbert', top_k=None)
+    legacy(posts[0])
+    start = time.perf_counter()
+    for text in posts:
+        legacy(text)
+    print(f'pipeline, one post per call  {args.posts / (time.perf_counter() - start):8.1f} posts/s')
+
+    scorer = SentimentScorer(max_length=args.max_length)
+    scorer.score(posts[:8], batch_size=8)
+    baseline = None
+    for batch_size in (1, 8, 32):
+        start = time.perf_counter()
+        results = scorer.score(posts, batch_size=batch_size)
+        rate = args.posts / (time.perf_counter() - start)
+        labels = [result['label'] for result in results]
+        baseline = baseline or labels
+        agreement = sum(a == b for a, b in zip(labels, baseline)) / len(labels) * 100
+        print(f'SentimentScorer batch {batch_size:>2}     {rate:8.1f} posts/s   labels match batch 1: {agreement:.1f}%')
+
+    print(f'calibration on this host picks batch size {scorer.calibrate(scorer._encode(posts))}')
+
+
+if __name__ == '__main__':
+    main()
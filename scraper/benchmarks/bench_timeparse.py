@@ -0,0 +1,88 @@
+"""
+Microbenchmark: crawler timestamp parsing over 100k real-format createdAt values.
+
+    python benchmarks/bench_timeparse.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeparse import parse_created_at, parse_created_at_bulk  # noqa: E402
+
+N = 100_000
+
+
+def legacy_parse_created_at(created_at):
+    """The strptime loop the crawler used before timeparse"""
+    if '.' in created_at:
+        date_part, time_part = created_at.split('.')
+        created_at = date_part
+
+    formats = [
+        '%Y-%m-%dT%H:%M:%S.%f%z',
+        '%Y-%m-%dT%H:%M:%S%z',
+        '%Y-%m-%dT%H:%M:%S.%fZ',
+        '%Y-%m-%dT%H:%M:%SZ',
+        '%Y-%m-%dT%H:%M:%S.%f',
+        '%Y-%m-%dT%H:%M:%S'
+    ]
+    for fmt in formats:
+        try:
+            parsed_datetime = datetime.strptime(created_at, fmt)
+            if '%z' in fmt or 'Z' in created_at:
+                return parsed_datetime.astimezone(timezone.utc)
+            return parsed_datetime.replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError(f"Time data '{created_at}' does not match any known formats")
+
+
+def make_timestamps(n):
+    """Mix of the shapes seen in Bluesky records: ms + Z, us + Z, no fraction, explicit offsets"""
+    random.seed(7)
+    base = datetime(2024, 11, 30, tzinfo=timezone.utc)
+    shapes = [
+        lambda dt: dt.strftime('%Y-%m-%dT%H:%M:%S.') + f'{dt.microsecond // 1000:03d}Z',
+        lambda dt: dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+        lambda dt: dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        lambda dt: dt.strftime('%Y-%m-%dT%H:%M:%S.%f+00:00'),
+        lambda dt: dt.astimezone(timezone(timedelta(hours=-5))).strftime('%Y-%m-%dT%H:%M:%S.%f-05:00'),
+    ]
+    weights = [70, 15, 5, 5, 5]
+    values = []
+    for _ in range(n):
+        dt = base + timedelta(seconds=random.randint(0, 86400), microseconds=random.randint(0, 999_999))
+        values.append(random.choices(shapes, weights)[0](dt))
+    return values
+
+
+def bench(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28} {elapsed * 1000:9.1f} ms  {N / elapsed:12,.0f} ts/s')
+    return result
+
+
+def main():
+    values = make_timestamps(N)
+
+    legacy = bench('legacy strptime loop', lambda: [legacy_parse_created_at(v) for v in values])
+    fast = bench('fromisoformat + regex', lambda: [parse_created_at(v) for v in values])
+
+    # The legacy parser drops the fraction and mishandles offsets when one is present
+    mismatches = sum(1 for a, b in zip(legacy, fast) if a != b)
+    print(f'legacy results differing from timeparse: {mismatches:,}')
+
+    try:
+        bench('pandas bulk (ISO8601)', lambda: parse_created_at_bulk(values))
+    except ImportError:
+        print('pandas bulk (ISO8601)        skipped, pandas not installed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Per-cycle fit time and JSON output size: the old TF-IDF + KMeans refit vs TopicClusterer.
+
+    python benchmarks/bench_topic_clustering.py [--cycles 12] [--posts 50]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.cluster import KMeans  # noqa: E402
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from topic_clusterer import TopicClusterer  # noqa: E402
+
+TOPICS = [
+    'fed rates inflation bonds yields treasury',
+    'bitcoin ethereum etf crypto wallet defi',
+    'earnings revenue guidance stocks nasdaq rally',
+    'startup funding venture series seed founders',
+]
+
+
+def make_posts(cycle, n):
+    """Posts mixing a few topic words into long-tail filler, like real top posts"""
+    random.seed(1000)
+    filler = [''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 9))) for _ in range(5000)]
+    random.seed(cycle)
+    posts = []
+    for _ in range(n):
+        words = random.choices(random.choice(TOPICS).split(), k=random.randint(3, 8))
+        words += random.choices(filler, k=random.randint(10, 40))
+        random.shuffle(words)
+        posts.append(' '.join(words))
+    return posts
+
+
+def legacy_clustering(texts):
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+    X = vectorizer.fit_transform(texts)
+    kmeans = KMeans(n_clusters=min(3, len(texts)), random_state=42)
+    kmeans.fit(X)
+    return {'clusters': kmeans.labels_.tolist(), 'centroids': kmeans.cluster_centers_.tolist()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cycles', type=int, default=12)
+    parser.add_argument('--posts', type=int, default=50)
+    args = parser.parse_args()
+
+    cycles = [make_posts(cycle, args.posts) for cycle in range(args.cycles)]
+    state_dir = tempfile.mkdtemp()
+    try:
+        legacy_time = legacy_bytes = 0
+        for texts in cycles:
+            start = time.perf_counter()
+            output = legacy_clustering(texts)
+            legacy_time += time.perf_counter() - start
+            legacy_bytes += len(json.dumps(output, indent=2))
+
+        clusterer = TopicClusterer(os.path.join(state_dir, 'bench_topics.pkl'))
+        clusterer_time = clusterer_bytes = 0
+        for texts in cycles:
+            start = time.perf_counter()
+            output = clusterer.update(texts)
+            clusterer_time += time.perf_counter() - start
+            clusterer_bytes += len(json.dumps(output, indent=2))
+
+        print(f'{args.cycles} cycles of {args.posts} posts')
+        print(f'TF-IDF + KMeans refit   {legacy_time / args.cycles * 1000:8.1f} ms/cycle   '
+              f'{legacy_bytes / args.cycles:10,.0f} B JSON/cycle')
+        print(f'TopicClusterer          {clusterer_time / args.cycles * 1000:8.1f} ms/cycle   '
+              f'{clusterer_bytes / args.cycles:10,.0f} B JSON/cycle   '
+              f'state file {os.path.getsize(clusterer.path):,} B')
+        print('final topics:', json.dumps(output['topics']))
+    finally:
+        shutil.rmtree(state_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BurstCallback = Callable[[Dict[str, Any]], None]
+
+
+class BurstDetector:
+    """
+    Streaming spike detector for hashtag and term counts.
+
+    Counts are kept per key in fixed time buckets. Each key holds an EWMA mean
+    and variance of its per-bucket count plus a short ring of open buckets, so
+    posts that arrive a little out of order still land in the right bucket.
+    A bucket is folded into the baseline once it leaves the ring.
+
+    Every observation re-checks the z-score of its bucket against the baseline,
+    so a spike is reported as soon as the posts are ingested, once per key and
+    bucket. A key only alerts once ``min_history`` buckets have been folded into
+    its baseline, so new keys and a cold start do not look like spikes; ``save``
+    and ``load`` carry baselines across restarts. At most ``max_keys`` keys are
+    tracked; the least recently updated key is dropped first.
+    """
+
+    # Zero-count buckets beyond this many contribute nothing measurable to the EWMA
+    MAX_FOLD = 200
+
+    def __init__(
+        self,
+        bucket_seconds: int = 300,
+        open_buckets: int = 6,
+        alpha: float = 0.1,
+        z_threshold: float = 4.0,
+        min_count: int = 5,
+        min_history: int = 12,
+        max_keys: int = 20_000
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.open_buckets = open_buckets
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.min_history = min_history
+        self.max_keys = max_keys
+
+        # key -> [mean, variance, newest bucket, {bucket: count}, last alerted bucket, folded buckets]
+        self.state: 'OrderedDict[Tuple[str, str, str], list]' = OrderedDict()
+        self.subscribers: List[BurstCallback] = []
+
+    def subscribe(self, callback: BurstCallback):
+        """Register a callback that receives every burst event"""
+        self.subscribers.append(callback)
+
+    def _fold(self, state: list, count: int):
+        diff = count - state[0]
+        increment = self.alpha * diff
+        state[0] += increment
+        state[1] = (1 - self.alpha) * (state[1] + diff * increment)
+        state[5] += 1
+
+    def _advance(self, state: list, newest: int):
+        """Fold buckets that fall out of the open ring into the baseline"""
+        first_open = newest - self.open_buckets + 1
+        previous_first = state[2] - self.open_buckets + 1
+        counts = state[3]
+        start = max(previous_first, first_open - self.MAX_FOLD)
+        for bucket in range(start, first_open):
+            self._fold(state, counts.pop(bucket, 0))
+        for bucket in [bucket for bucket in counts if bucket < first_open]:
+            del counts[bucket]
+        state[2] = newest
+
+    def observe(self, category: Optional[str], kind: str, value: str, timestamp: float, count: int = 1):
+        """Count an occurrence of a hashtag or term at timestamp (epoch seconds)"""
+        key = (category, kind, value)
+        bucket = int(timestamp // self.bucket_seconds)
+
+        state = self.state.get(key)
+        if state is None:
+            state = self.state[key] = [0.0, 0.0, bucket, {}, None, 0]
+            if len(self.state) > self.max_keys:
+                self.state.popitem(last=False)
+        else:
+            self.state.move_to_end(key)
+
+        if bucket > state[2]:
+            self._advance(state, bucket)
+        elif bucket <= state[2] - self.open_buckets:
+            # Too late to change a bucket already folded into the baseline
+            return
+
+        counts = state[3]
+        counts[bucket] = counts.get(bucket, 0) + count
+        current = counts[bucket]
+
+        # Poisson-style floor keeps rare keys from alerting on tiny variances
+        std = math.sqrt(max(state[1], state[0], 1.0))
+        z_score = (current - state[0]) / std
+        if (
+            current >= self.min_count and z_score >= self.z_threshold
+            and state[5] >= self.min_history and state[4] != bucket
+        ):
+            state[4] = bucket
+            self._emit({
+                'category': category,
+                'kind': kind,
+                'value': value,
+                'count': current,
+                'baseline': round(state[0], 3),
+                'z_score': round(z_score, 2),
+                'bucket_start': bucket * self.bucket_seconds,
+                'detected_at': time.time()
+            })
+
+    def save(self, path: str):
+        """Persist per-key baselines and open buckets so a restart keeps its history"""
+        data = [
+            [*key, mean, variance, newest, {str(bucket): count for bucket, count in counts.items()}, alerted, folded]
+            for key, (mean, variance, newest, counts, alerted, folded) in self.state.items()
+        ]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(f'{path}.tmp', path)
+
+    def load(self, path: str):
+        """Restore state written by save; a missing or unreadable file starts empty"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load burst detector state from {path}: {e}")
+            return
+
+        self.state = OrderedDict(
+            ((category, kind, value), [mean, variance, newest, {int(b): c for b, c in counts.items()}, alerted, folded])
+            for category, kind, value, mean, variance, newest, counts, alerted, folded in data[-self.max_keys:]
+        )
+
+    def _emit(self, event: Dict[str, Any]):
+        for callback in self.subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Burst subscriber failed for {event['kind']} {event['value']}: {e}")
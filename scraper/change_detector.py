@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from feature_store import post_key
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeDetector:
+    """
+    Decide whether a category's top posts changed enough to justify new LLM output.
+
+    Each published cycle records a content hash of the posts, their URIs and the
+    insights generated from them. A later cycle whose hash matches, or whose URI
+    set has Jaccard similarity of at least ``1 - threshold``, reuses those
+    insights. Skipped cycles and the LLM seconds they saved are kept per category.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.2):
+        self.path = path
+        self.threshold = threshold
+        self.state: Dict[str, Dict[str, Any]] = self.load()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f'{self.path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(f'{self.path}.tmp', self.path)
+
+    @classmethod
+    def fingerprint(cls, posts: List[Dict[str, Any]]) -> str:
+        digest = hashlib.sha256()
+        for key, text in sorted((post_key(post), post['text']) for post in posts):
+            digest.update(key.encode('utf-8') + b'\0' + text.encode('utf-8') + b'\0')
+        return digest.hexdigest()
+
+    def similarity(self, category: str, posts: List[Dict[str, Any]]) -> float:
+        """Jaccard similarity of this input's post keys with the last published input"""
+        previous = set(self.state.get(category, {}).get('keys', []))
+        current = {post_key(post) for post in posts}
+        if not previous and not current:
+            return 1.0
+        return len(previous & current) / len(previous | current)
+
+    def reusable(self, category: str, posts: List[Dict[str, Any]]) -> Optional[str]:
+        """Previous insights if the input barely changed (counted as a skipped cycle), else None"""
+        entry = self.state.get(category)
+        if not entry or 'hash' not in entry:
+            return None
+
+        if entry['hash'] != self.fingerprint(posts):
+            similarity = self.similarity(category, posts)
+            if 1 - similarity >= self.threshold:
+                return None
+            logger.info(f"{category} input is {similarity * 100:.0f}% unchanged; reusing insights")
+        else:
+            logger.info(f"{category} input is identical; reusing insights")
+
+        entry['skipped_cycles'] += 1
+        entry['llm_seconds_saved'] = round(entry['llm_seconds_saved'] + entry['llm_seconds'], 2)
+        self.save()
+        return entry['insights']
+
+    def last_insights(self, category: str) -> Optional[str]:
+        entry = self.state.get(category)
+        return entry.get('insights') if entry else None
+
+    def forget(self, category: str):
+        """Drop a category's baseline, keeping its skip counters"""
+        entry = self.state.get(category)
+        if entry and 'hash' in entry:
+            for key in ('hash', 'keys', 'insights', 'llm_seconds'):
+                entry.pop(key, None)
+            self.save()
+
+    def record(self, category: str, posts: List[Dict[str, Any]], insights: str, llm_seconds: float):
+        """Remember the input and insights of a published cycle"""
+        entry = self.state.get(category, {'skipped_cycles': 0, 'llm_seconds_saved': 0.0})
+        entry.update({
+            'hash': self.fingerprint(posts),
+            'keys': sorted({post_key(post) for post in posts}),
+            'insights': insights,
+            'llm_seconds': round(llm_seconds, 2)
+        })
+        self.state[category] = entry
+        self.save()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            category: {'skipped_cycles': entry['skipped_cycles'], 'llm_seconds_saved': entry['llm_seconds_saved']}
+            for category, entry in self.state.items()
+        }
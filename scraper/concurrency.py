@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDController:
+    """
+    Cap in-flight requests with additive-increase / multiplicative-decrease.
+
+    The limit grows by one after a full window of successes and is cut by the
+    backoff factor on 429s, 5xx responses, timeouts and other retryable errors.
+    Calls are retried with jittered exponential backoff and a per-request timeout.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 32, backoff: float = 0.5,
+                 timeout: float = 15.0, retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 retryable: Tuple[Type[BaseException], ...] = ()):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.timeout = timeout
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = (asyncio.TimeoutError,) + tuple(retryable)
+
+        self.in_flight = 0
+        self._condition = None
+        self._success_streak = 0
+        self._last_decrease = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {'requests': 0, 'attempts': 0, 'throttled': 0, 'failed': 0, 'started_at': time.perf_counter()}
+
+    def _get_condition(self):
+        # Created lazily so the controller can be built outside a running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @staticmethod
+    def _status_code(error):
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None)
+
+    def is_overload(self, error: BaseException) -> bool:
+        """Whether an error means the server wants us to slow down"""
+        status = self._status_code(error)
+        if status is not None:
+            return status == 429 or status >= 500
+        return isinstance(error, self.retryable)
+
+    def _retry_delay(self, error, attempt):
+        """Honour Retry-After / ratelimit-reset when present, else jittered exponential backoff"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            if 'retry-after' in headers:
+                return min(float(headers['retry-after']), self.max_delay)
+            if 'ratelimit-reset' in headers:
+                return min(max(float(headers['ratelimit-reset']) - time.time(), 0.0), self.max_delay)
+        except (TypeError, ValueError):
+            pass
+        delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _on_success(self):
+        self._success_streak += 1
+        if self._success_streak >= self.limit:
+            self._success_streak = 0
+            if self.limit < self.maximum:
+                self.limit += 1
+
+    def _on_overload(self):
+        self._success_streak = 0
+        # One congestion event usually fails several in-flight requests; cut the limit once for it
+        now = time.monotonic()
+        if now - self._last_decrease < self.base_delay:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, int(self.limit * self.backoff))
+        logger.info(f"Backing off, concurrency limit now {self.limit}")
+
+    async def _acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def _release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Run fn under the concurrency limit, retrying overload errors"""
+        self.stats['requests'] += 1
+        for attempt in range(self.retries + 1):
+            await self._acquire()
+            self.stats['attempts'] += 1
+            try:
+                result = await asyncio.wait_for(fn(*args, **kwargs), timeout=self.timeout)
+                self._on_success()
+                return result
+            except Exception as e:
+                if not self.is_overload(e) or attempt == self.retries:
+                    self.stats['failed'] += 1
+                    raise
+                self.stats['throttled'] += 1
+                self._on_overload()
+                delay = self._retry_delay(e, attempt)
+            finally:
+                await self._release()
+
+            await asyncio.sleep(delay)
+
+    def report(self, items: int) -> str:
+        """Summarize throughput and error rates since the last reset"""
+        elapsed = time.perf_counter() - self.stats['started_at']
+        attempts = self.stats['attempts'] or 1
+        requests = self.stats['requests'] or 1
+        return (
+            f"{items / elapsed if elapsed else 0:.1f} posts/s, "
+            f"{self.stats['throttled'] / attempts:.1%} attempts throttled, "
+            f"{self.stats['failed'] / requests:.1%} requests failed, "
+            f"concurrency limit {self.limit}"
+        )
@@ -3,14 +3,27 @@ import json
 import logging
 import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime, timedelta, timezone
 
 import aiofiles
+import httpx
 # Using atproto for AT Protocol interactions
-from atproto import AsyncClient
+from atproto import AsyncClient, AsyncRequest
+from atproto_client.exceptions import NetworkError
 from dotenv import load_dotenv
 
+from burst_detector import BurstDetector
+from concurrency import AIMDController
+from dedupe import RollingBloomFilter
+from keyword_matcher import KeywordMatcher
+from post_record import PostRecord
+from post_store import PostStore
+from query_planner import QueryPlanner
+from session_manager import SessionManager
+from timeparse import parse_created_at
+from trend_engine import TrendEngine
+
 
 # Configure logging
 def setup_logging():
@@ -35,6 +48,57 @@ logger = setup_logging()
 
 
 class BlueskyAdvancedCrawler:
+    # Terms searched for the category feeds each crawl cycle
+    SEARCH_TERMS = {
+        'stocks': ['stocks', 'finance', 'investment', 'market', 'trading'],
+        'crypto': ['bitcoin', 'ethereum', 'crypto', 'blockchain'],
+        'trends': {
+            'tech': ['ai', 'technology', 'startup'],
+            'finance': ['fintech', 'investment', 'market'],
+            'crypto': ['cryptocurrency', 'blockchain'],
+            'entertainment': ['movies', 'streaming', 'entertainment']
+        }
+    }
+
+    # getPosts accepts at most 25 URIs per call
+    GET_POSTS_BATCH = 25
+    # Retained posts ranked just below the top N also get their likes refreshed, since they may overtake it
+    LIKES_REFRESH_MARGIN = 25
+    # Unfinished stretches between a page cursor and an older watermark, kept per term
+    MAX_SEARCH_GAPS = 4
+
+    # Terms searched per trend category by analyze_trends
+    TREND_CATEGORIES = {
+        'tech': [
+            'ai', 'technology', 'startup',
+            'machine learning', 'cloud computing',
+            'cybersecurity', 'robotics',
+            'quantum computing', 'virtual reality',
+            'augmented reality', 'internet of things'
+        ],
+        'finance': [
+            'investing', 'market', 'stocks',
+            'cryptocurrency', 'fintech',
+            'trading', 'mutual funds',
+            'venture capital', 'derivatives',
+            'bonds', 'portfolio management'
+        ],
+        'crypto': [
+            'blockchain', 'bitcoin', 'ethereum',
+            'defi', 'nft', 'altcoins',
+            'smart contracts', 'crypto mining',
+            'decentralized finance', 'web3',
+            'digital wallet', 'token economics'
+        ],
+        'entertainment': [
+            'movies', 'streaming', 'entertainment',
+            'gaming', 'esports', 'podcasts',
+            'social media', 'virtual concerts',
+            'content creation', 'streaming platforms',
+            'digital media', 'interactive entertainment'
+        ]
+    }
+
     def __init__(self):
         # Log initialization start
         logger.info("Initializing BlueskyAdvancedCrawler")
@@ -42,19 +106,42 @@ class BlueskyAdvancedCrawler:
         # Load environment variables
         load_dotenv()
 
-        # Initialize Bluesky async client
-        self.client = AsyncClient()
+        # Initialize Bluesky async client with a connection pool sized for the search fan-out
+        self.client = AsyncClient(request=AsyncRequest(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60),
+            timeout=httpx.Timeout(20.0, connect=5.0)
+        ))
+        # Adaptive cap on concurrent searches, backing off on 429/5xx
+        self.search_controller = AIMDController(
+            initial=int(os.getenv('CRAWL_CONCURRENCY', 4)),
+            maximum=int(os.getenv('CRAWL_MAX_CONCURRENCY', 16)),
+            retryable=(NetworkError,)
+        )
+        self.session_manager = SessionManager(
+            os.getenv('BLUESKY_HANDLE_'),
+            os.getenv('BLUESKY_PASSWORD_'),
+            os.path.join(os.path.dirname(__file__), '.sessions')
+        )
+        # Set when a search hits a real auth failure; the next cycle logs in again first
+        self.force_login = False
 
         # Define base data store path
         base_path = os.path.join(os.path.dirname(__file__), 'data')
         logger.info(f"Base data path set to: {base_path}")
 
-        # Optimized categories structure
+        # Categorization keywords live in config.json
+        with open(os.path.join(os.path.dirname(__file__), 'config.json'), 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.category_matcher = KeywordMatcher(self.config['category_keywords'])
+
+        # Category posts are appended to a store partitioned by category and hour
+        self.post_store = PostStore(
+            os.path.join(base_path, 'posts'),
+            compress=os.getenv('POST_STORE_COMPRESSION', '').lower() == 'zstd'
+        )
+
+        # Latest trend summaries, read by the analysis workflow
         self.categories = {
-            'stock_updates': os.path.join(base_path, 'stocks', 'latest.json'),
-            'financial_news': os.path.join(base_path, 'financial_news', 'latest.json'),
-            'investment_insights': os.path.join(base_path, 'investment_insights', 'latest.json'),
-            'crypto_news': os.path.join(base_path, 'crypto', 'latest.json'),
             'trends': {
                 'tech': os.path.join(base_path, 'trends', 'tech_trends.json'),
                 'finance': os.path.join(base_path, 'trends', 'finance_trends.json'),
@@ -64,14 +151,45 @@ class BlueskyAdvancedCrawler:
         }
         logger.info("Categories and paths configured successfully")
 
-    async def authenticate(self):
-        """Authenticate with Bluesky"""
+        # Incremental crawl state: per-term high-water mark plus the posts still inside the window
+        self.state_path = os.path.join(base_path, 'crawl_state.json')
+        self.max_pages = int(os.getenv('CRAWL_MAX_PAGES', 5))
+        self.window = timedelta(hours=2)
+        self.crawl_state = self.load_crawl_state()
+        self.ingest_stats = {'posts': 0, 'search_calls': 0, 'refresh_calls': 0}
+
+        # Windowed hashtag counts per trend category, updated as new posts are ingested
+        self.term_categories = {}
+        for category, terms in self.TREND_CATEGORIES.items():
+            for term in terms:
+                self.term_categories.setdefault(term, []).append(category)
+        self.trend_engine_path = os.path.join(base_path, 'trends', 'hashtag_windows.json')
+        self.trend_engine = TrendEngine()
+        self.trend_engine.load(self.trend_engine_path)
+
+        # Hashtag and term spikes are flagged as posts are ingested, not at the next analysis
+        self.bursts_path = os.path.join(base_path, 'trends', 'bursts.ndjson')
+        self.burst_detector = BurstDetector(
+            z_threshold=float(os.getenv('BURST_Z_THRESHOLD', 4.0)),
+            min_history=int(os.getenv('BURST_MIN_HISTORY', 12))
+        )
+        self.burst_state_path = os.path.join(base_path, 'trends', 'burst_state.json')
+        self.burst_detector.load(self.burst_state_path)
+        self.burst_detector.subscribe(self.record_burst)
+
+        # Callbacks receiving (category, trend summary) as soon as each summary is saved
+        self.trend_subscribers = []
+
+        # Posts already stored by earlier cycles; the window re-returns them on every crawl
+        self.stored_uris = None
+        if os.getenv('CRAWL_CROSS_CYCLE_DEDUPE', '1') != '0':
+            self.stored_uris = RollingBloomFilter(capacity=int(os.getenv('CRAWL_DEDUPE_CAPACITY', 200_000)))
+
+    async def authenticate(self, force=False):
+        """Authenticate with Bluesky, reusing the saved session unless it has just failed"""
         try:
             logger.info("Attempting to authenticate with Bluesky")
-            await self.client.login(
-                os.getenv('BLUESKY_HANDLE_'),
-                os.getenv('BLUESKY_PASSWORD_')
-            )
+            await self.session_manager.login_async(self.client, force=force)
             logger.info('Authentication successful')
         except Exception as e:
             logger.error(f'Authentication failed: {e}')
@@ -84,203 +202,330 @@ class BlueskyAdvancedCrawler:
         logger.debug(f"Extracted {len(hashtags)} unique hashtags from text")
         return hashtags
 
-    async def search_posts(self, search_term: str, limit: int = 100,top_n:int =50) -> List[Dict[str, Any]]:
-        """Async method to search posts with error handling"""
+    def load_crawl_state(self) -> Dict[str, Any]:
+        """Load per-term watermarks and windowed posts from the last run"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            for term_state in state.values():
+                term_state['recent'] = [PostRecord.from_dict(post) for post in term_state['recent']]
+            logger.info(f"Loaded crawl state for {len(state)} terms")
+            return state
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    async def save_crawl_state(self):
+        """Persist crawl state atomically so a restart resumes from the same watermarks"""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f'{self.state_path}.tmp'
+        async with aiofiles.open(tmp_path, 'w') as f:
+            await f.write(json.dumps({
+                term: {**term_state, 'recent': [post.to_dict() for post in term_state['recent']]}
+                for term, term_state in self.crawl_state.items()
+            }))
+        os.replace(tmp_path, self.state_path)
+        # Baselines advance with the watermarks, so save them together
+        await asyncio.to_thread(self.burst_detector.save, self.burst_state_path)
+
+    async def fetch_pages(self, search_term: str, limit: int, cursor: Optional[str], stop: Optional[Dict[str, str]],
+                          window_start: datetime, known_uris: Set[str], max_pages: int):
+        """
+        Page newest-first results from cursor until the stop watermark or the window start.
+
+        Returns the new posts, the newest post seen, the cursor to resume from
+        (None once the stretch is drained) and the API calls made.
+        """
+        window_start_ts = int(window_start.timestamp())
+        posts = []
+        newest = None
+        api_calls = 0
+        while api_calls < max_pages:
+            params = {"q": search_term, "limit": limit, "sort": "latest"}
+            if cursor:
+                params["cursor"] = cursor
+            # Use app.bsky.feed.searchPosts method from atproto
+            results = await self.search_controller.call(self.client.app.bsky.feed.search_posts, params)
+            api_calls += 1
+
+            reached_known = False
+            for post in results.posts:
+                if newest is None:
+                    newest = {'indexed_at': post.indexed_at, 'uri': post.uri}
+                if stop and (post.uri == stop['uri'] or post.indexed_at < stop['indexed_at']):
+                    reached_known = True
+                    break
+                if self.parse_created_at(post.indexed_at) <= window_start:
+                    reached_known = True
+                    break
+                if post.uri in known_uris:
+                    continue
+                known_uris.add(post.uri)
+                record = PostRecord.create(
+                    post.uri,
+                    post.record.text,
+                    post.record.created_at,
+                    post.like_count,
+                    self.extract_hashtags(post.record.text)
+                )
+                if record.created_at > window_start_ts:
+                    posts.append(record)
+
+            cursor = results.cursor
+            if reached_known or not cursor or not results.posts:
+                return posts, newest, None, api_calls
+        return posts, newest, cursor, api_calls
+
+    async def search_posts(self, search_term: str, limit: int = 100,top_n:int =50) -> List[PostRecord]:
+        """Fetch posts newer than the term's watermark and return the top posts in the window"""
         logger.info(f"Searching posts for term: {search_term}")
         try:
             now = datetime.now(timezone.utc)
-            one_hour_ago = now - timedelta(hours=2)
-            # Use app.bsky.feed.searchPosts method from atproto
-            results = await self.client.app.bsky.feed.search_posts({"q": search_term, "limit": limit})
-            logger.info(f"Found {len(results.posts)} posts for term: {search_term}")
-
-            processed_posts = [
-                {
-                    'text': post.record.text,
-                    'created_at': post.record.created_at,
-                    'likes': post.like_count,
-                    'hashtags': self.extract_hashtags(post.record.text)
-                }
-                for post in results.posts if self.parse_created_at(post.record.created_at) > one_hour_ago
-            ]
+            window_start = now - self.window
+            window_start_ts = int(window_start.timestamp())
+            state = self.crawl_state.get(search_term, {'watermark': None, 'recent': []})
+            watermark = state['watermark']
+            gaps = list(state.get('gaps', []))
+            known_uris = {post.uri for post in state['recent']}
+
+            # Page through newest-first results until we reach the watermark or leave the window
+            new_posts, newest, cursor, search_calls = await self.fetch_pages(
+                search_term, limit, None, watermark, window_start, known_uris, self.max_pages
+            )
+            if cursor:
+                # Out of pages before the watermark: the watermark still advances, and the
+                # stretch below this cursor is resumed on later cycles
+                logger.warning(
+                    f"Search for {search_term} used all {search_calls} pages before reaching its watermark; "
+                    f"resuming the rest on later cycles"
+                )
+                gaps.insert(0, {'cursor': cursor, 'until': watermark})
+                if len(gaps) > self.MAX_SEARCH_GAPS:
+                    logger.warning(f"Dropping {len(gaps) - self.MAX_SEARCH_GAPS} unfinished gaps for {search_term}")
+                    del gaps[self.MAX_SEARCH_GAPS:]
+
+            # Spend any pages left on gaps from earlier cycles, newest first
+            while gaps and search_calls < self.max_pages:
+                gap = gaps[0]
+                try:
+                    posts, _, gap_cursor, api_calls = await self.fetch_pages(
+                        search_term, limit, gap['cursor'], gap['until'], window_start, known_uris,
+                        self.max_pages - search_calls
+                    )
+                except Exception as e:
+                    # A cursor the server no longer accepts would fail every cycle
+                    logger.warning(f"Dropping unfinished gap for {search_term}: {e}")
+                    gaps.pop(0)
+                    search_calls += 1
+                    continue
+                new_posts.extend(posts)
+                search_calls += api_calls
+                if gap_cursor:
+                    gap['cursor'] = gap_cursor
+                else:
+                    gaps.pop(0)
+
+            # Keep new posts plus earlier ones that are still inside the window
+            retained = [post for post in state['recent'] if post.created_at > window_start_ts]
+            # Latest-sorted search returns posts young, so refresh the likes of retained posts that
+            # could reach the top N before ranking
+            candidates = sorted(retained, key=lambda x: x.likes, reverse=True)[:top_n + self.LIKES_REFRESH_MARGIN]
+            refresh_calls = await self.refresh_likes(candidates)
+            recent = new_posts + retained
+            self.crawl_state[search_term] = {'watermark': newest or watermark, 'recent': recent, 'gaps': gaps}
+
+            self.ingest_new_posts(search_term, new_posts)
+            self.ingest_stats['posts'] += len(new_posts)
+            self.ingest_stats['search_calls'] += search_calls
+            self.ingest_stats['refresh_calls'] += refresh_calls
+            logger.info(
+                f"Ingested {len(new_posts)} new posts for term: {search_term} in {search_calls} search calls, "
+                f"{refresh_calls} like refresh calls"
+            )
 
-            top_posts = sorted(processed_posts, key=lambda x: x['likes'], reverse=True)[:top_n]
+            top_posts = sorted(recent, key=lambda x: x.likes, reverse=True)[:top_n]
 
-            logger.debug(f"Processed {len(processed_posts)} posts")
+            logger.debug(f"Processed {len(recent)} posts")
             return top_posts
         except Exception as e:
+            # Keep serving the posts already in the window rather than emptying the category
             logger.error(f'Search error for {search_term}: {e}')
-            return []
-
-    def parse_created_at(self,created_at):
-        """Attempt to parse the 'created_at' timestamp with various formats."""
-
-        if '.' in created_at:
-            date_part, time_part = created_at.split('.')
-            time_part = time_part.ljust(6, '0')
-            created_at = date_part
-
-        formats = [
-            '%Y-%m-%dT%H:%M:%S.%f%z',  # With fractional seconds and timezone
-            '%Y-%m-%dT%H:%M:%S%z',  # Without fractional seconds, with timezone
-            '%Y-%m-%dT%H:%M:%S.%fZ',  # With fractional seconds, Z timezone
-            '%Y-%m-%dT%H:%M:%SZ',  # Without fractional seconds, Z timezone
-            '%Y-%m-%dT%H:%M:%S.%f',
-            '%Y-%m-%dT%H:%M:%S'
-        ]
-        for fmt in formats:
+            if SessionManager.is_auth_error(e):
+                self.force_login = True
+            recent = self.crawl_state.get(search_term, {}).get('recent', [])
+            return sorted(recent, key=lambda x: x.likes, reverse=True)[:top_n]
+
+    async def refresh_likes(self, posts: List[PostRecord]) -> int:
+        """Update like counts in place from getPosts; returns the API calls made"""
+        api_calls = 0
+        for start in range(0, len(posts), self.GET_POSTS_BATCH):
+            batch = {post.uri: post for post in posts[start:start + self.GET_POSTS_BATCH]}
             try:
-                parsed_datetime = datetime.strptime(created_at, fmt)
-                if '%z' in fmt or 'Z' in created_at:
-                    return parsed_datetime.astimezone(timezone.utc)  # Convert to UTC timezone-aware
-                    # If the datetime is naive (no timezone), assume UTC
-                return parsed_datetime.replace(tzinfo=timezone.utc)
-            except ValueError:
+                results = await self.search_controller.call(self.client.app.bsky.feed.get_posts, {'uris': list(batch)})
+            except Exception as e:
+                # Rank this batch by its last known likes rather than failing the search
+                logger.warning(f'Could not refresh likes for {len(batch)} posts: {e}')
                 continue
-        raise ValueError(f"Time data '{created_at}' does not match any known formats")
+            finally:
+                api_calls += 1
+            for post in results.posts:
+                if post.uri in batch:
+                    batch[post.uri].likes = post.like_count or 0
+        return api_calls
+
+    def ingest_new_posts(self, search_term: str, posts: List[PostRecord]):
+        """Feed newly ingested posts to the trend engine and burst detector"""
+        categories = self.term_categories.get(search_term, [])
+        for post in sorted(posts, key=lambda x: x.created_at):
+            self.burst_detector.observe(categories[0] if categories else None, 'term', search_term, post.created_at)
+            for category in categories:
+                # Hashtags count once per category even when several terms return the post
+                if self.trend_engine.ingest(category, post):
+                    for hashtag in post.hashtags:
+                        self.burst_detector.observe(category, 'hashtag', hashtag, post.created_at)
+
+    def subscribe_trends(self, callback):
+        """Register a callback that receives each category's trend summary once it is saved"""
+        self.trend_subscribers.append(callback)
+
+    def record_burst(self, event: Dict[str, Any]):
+        """Log a burst event and append it to the alerts file"""
+        logger.warning(
+            f"Burst in {event['category'] or 'uncategorized'}: {event['kind']} '{event['value']}' "
+            f"{event['count']} posts vs baseline {event['baseline']} (z={event['z_score']})"
+        )
+        try:
+            os.makedirs(os.path.dirname(self.bursts_path), exist_ok=True)
+            with open(self.bursts_path, 'a') as f:
+                f.write(json.dumps(event) + '\n')
+        except OSError as e:
+            logger.error(f'Error recording burst event: {e}')
+
+    def parse_created_at(self,created_at):
+        """Parse the 'created_at' timestamp into a timezone-aware UTC datetime"""
+        return parse_created_at(created_at)
 
     async def crawl_financial_content(self):
         """Comprehensive financial content crawler with async operations"""
         logger.info("Starting financial content crawl")
-        search_terms = {
-            'stocks': ['stocks', 'finance', 'investment', 'market', 'trading'],
-            'crypto': ['bitcoin', 'ethereum', 'crypto', 'blockchain'],
-            'trends': {
-                'tech': ['ai', 'technology', 'startup'],
-                'finance': ['fintech', 'investment', 'market'],
-                'crypto': ['cryptocurrency', 'blockchain'],
-                'entertainment': ['movies', 'streaming', 'entertainment']
-            }
-        }
-
-        all_posts = {
-            'stock_updates': [],
-            'financial_news': [],
-            'investment_insights': [],
-            'crypto_news': [],
-            'trends': {category: [] for category in search_terms['trends']}
-        }
-
-        # Use asyncio.gather for concurrent search operations
-        search_tasks = []
-        for category, terms in search_terms.items():
-            if category == 'trends':
-                continue
-            for term in terms:
-                search_tasks.append(self.search_posts(term))
-
-        # Collect results from all search tasks
-        logger.info(f"Gathering results from {len(search_tasks)} search tasks")
-        search_results = await asyncio.gather(*search_tasks)
+        if self.force_login:
+            await self.authenticate(force=True)
+            self.force_login = False
+        search_terms = self.SEARCH_TERMS
+        self.ingest_stats = {'posts': 0, 'search_calls': 0, 'refresh_calls': 0}
+        self.search_controller.reset_stats()
+
+        all_posts = {category: [] for category in self.config['category_keywords']}
+        all_posts['trends'] = {category: [] for category in search_terms['trends']}
+
+        crawl_terms = [
+            term for category, terms in search_terms.items() if category != 'trends' for term in terms
+        ]
+        trend_terms = [term for terms in self.TREND_CATEGORIES.values() for term in terms]
+
+        # Search the union of crawl and trend terms once; both consumers read the cached results
+        planner = QueryPlanner(self.search_posts)
+        await planner.run(crawl_terms, trend_terms)
+        search_results = planner.results_for(crawl_terms)
+
+        await self.save_crawl_state()
+        search_calls = self.ingest_stats['search_calls']
+        logger.info(
+            f"Ingested {self.ingest_stats['posts']} new posts in {search_calls} search calls "
+            f"({self.ingest_stats['posts'] / search_calls if search_calls else 0:.1f} posts per call), "
+            f"plus {self.ingest_stats['refresh_calls']} like refresh calls"
+        )
+        logger.info(f"Search fan-out: {self.search_controller.report(self.ingest_stats['posts'])}")
 
-        # Process and categorize posts
+        # Process and categorize posts; terms overlap, so each URI is categorized once
+        returned = 0
+        seen_uris = set()
+        unique_posts = []
         for results in search_results:
             for post in results:
-                # Categorization logic
-                if any(keyword in post['text'].lower() for keyword in ['stock', 'market', 'trading']):
-                    all_posts['stock_updates'].append(post)
-                if any(keyword in post['text'].lower() for keyword in ['financial', 'economy', 'report']):
-                    all_posts['financial_news'].append(post)
-                if any(keyword in post['text'].lower() for keyword in ['investment', 'strategy']):
-                    all_posts['investment_insights'].append(post)
-                if 'crypto' in post['text'].lower():
-                    all_posts['crypto_news'].append(post)
+                returned += 1
+                if post.uri in seen_uris:
+                    continue
+                seen_uris.add(post.uri)
+                unique_posts.append(post)
+
+        # Categorization logic: one scan over every post's text for all categories
+        for post, categories in zip(unique_posts, self.category_matcher.match_many(post.text for post in unique_posts)):
+            for category in categories:
+                all_posts[category].append(post)
+
+        # Only store posts that earlier cycles have not stored already
+        stored = 0
+        if self.stored_uris is not None:
+            fresh_uris = {uri for uri in seen_uris if uri not in self.stored_uris}
+            stored = len(seen_uris) - len(fresh_uris)
+            for category in self.config['category_keywords']:
+                all_posts[category] = [post for post in all_posts[category] if post.uri in fresh_uris]
+
+        duplicates = returned - len(seen_uris)
+        logger.info(
+            f"Dedupe: {duplicates} of {returned} returned posts were cross-term duplicates "
+            f"({duplicates / returned * 100 if returned else 0:.1f}%, categorizations skipped), "
+            f"{stored} unique posts already stored by earlier cycles (store writes skipped)"
+        )
 
         logger.info("Finished crawling financial content")
-        await self.save_posts(all_posts)
-        await self.analyze_trends()
-
-    def _get_all_file_paths(self):
-        """Recursively extract all file paths from the categories dictionary"""
-        logger.debug("Extracting all file paths from categories")
-        paths = []
-        for value in self.categories.values():
-            if isinstance(value, str):
-                paths.append(value)
-            elif isinstance(value, dict):
-                paths.extend(self._get_dict_paths(value))
-        logger.info(f"Found {len(paths)} file paths")
-        return paths
-
-    def _get_dict_paths(self, d):
-        """Helper method to get paths from nested dictionaries"""
-        paths = []
-        for value in d.values():
-            if isinstance(value, str):
-                paths.append(value)
-            elif isinstance(value, dict):
-                paths.extend(self._get_dict_paths(value))
-        return paths
-
-    async def save_posts(self, posts: Dict[str, List[Dict[str, Any]]]):
-        """Async post saving with error handling"""
-        logger.info("Starting to save posts")
+        saved = await self.save_posts(all_posts)
+        if self.stored_uris is not None:
+            self.mark_stored(all_posts, saved)
+        await self.analyze_trends(planner)
+
+    def mark_stored(self, posts: Dict[str, List[PostRecord]], saved: Set[str]):
+        """Remember URIs whose every category was written, so posts from failed writes are retried"""
+        failed = {
+            post.uri for category, data in posts.items()
+            if category not in saved and isinstance(data, list) for post in data
+        }
+        for category in saved:
+            for post in posts[category]:
+                if post.uri not in failed:
+                    self.stored_uris.add(post.uri)
 
-        # Create directories if they don't exist
-        all_paths = self._get_all_file_paths()
-        for path in [os.path.dirname(file_path) for file_path in all_paths]:
-            os.makedirs(path, exist_ok=True)
-            logger.debug(f"Ensuring directory exists: {path}")
+    async def save_posts(self, posts: Dict[str, List[PostRecord]]) -> Set[str]:
+        """Append the cycle's categorized posts to the post store; returns the categories written"""
+        logger.info("Starting to save posts")
+        saved = set()
 
         async def save_category(category, data):
             try:
-                if isinstance(self.categories[category],dict):
-                    for item in self.categories[category]:
-                        async with aiofiles.open(item, 'w') as f:
-                            await f.write(json.dumps(data, indent=2))
-                else:
-                    async with aiofiles.open(self.categories[category], 'w') as f:
-                        await f.write(json.dumps(data, indent=2))
-                logger.info(f'Saved {len(data)} {category} posts')
+                records = [post.to_dict() for post in data]
+                written = await asyncio.to_thread(self.post_store.append, category, records)
+                saved.add(category)
+                logger.info(f'Saved {written} {category} posts')
             except Exception as e:
-                logger.error(f'Error saving {self.categories[category]} {category} posts: {e}',stack_info=True)
+                logger.error(f'Error saving {category} posts: {e}',stack_info=True)
 
-        # Use asyncio.gather for concurrent file writes
+        # Appends write separate part files, so categories can be saved concurrently
         await asyncio.gather(
-            *[save_category(category, data) for category, data in posts.items() if data]
+            *[save_category(category, data) for category, data in posts.items() if isinstance(data, list) and data]
         )
+        await asyncio.to_thread(self.post_store.compact)
         logger.info("Completed saving posts for all categories")
+        return saved
 
-    async def analyze_trends(self):
+    async def analyze_trends(self, planner: QueryPlanner = None):
         """Advanced trend analysis with async processing"""
         logger.info("Starting trend analysis")
-        trend_categories = {
-            'tech': [
-                'ai', 'technology', 'startup',
-                'machine learning', 'cloud computing',
-                'cybersecurity', 'robotics',
-                'quantum computing', 'virtual reality',
-                'augmented reality', 'internet of things'
-            ],
-            'finance': [
-                'investing', 'market', 'stocks',
-                'cryptocurrency', 'fintech',
-                'trading', 'mutual funds',
-                'venture capital', 'derivatives',
-                'bonds', 'portfolio management'
-            ],
-            'crypto': [
-                'blockchain', 'bitcoin', 'ethereum',
-                'defi', 'nft', 'altcoins',
-                'smart contracts', 'crypto mining',
-                'decentralized finance', 'web3',
-                'digital wallet', 'token economics'
-            ],
-            'entertainment': [
-                'movies', 'streaming', 'entertainment',
-                'gaming', 'esports', 'podcasts',
-                'social media', 'virtual concerts',
-                'content creation', 'streaming platforms',
-                'digital media', 'interactive entertainment'
-            ]
-        }
+        trend_categories = self.TREND_CATEGORIES
+
+        # Reuse the crawl cycle's searches when available; otherwise search the trend terms now
+        if planner is None:
+            planner = QueryPlanner(self.search_posts)
+            await planner.run(*trend_categories.values())
+            await self.save_crawl_state()
+
         trend_analysis = {}
+        returned = counted = 0
 
         # Async trend search and analysis
         for category, terms in trend_categories.items():
             logger.info(f"Analyzing trends for category: {category}")
-            trend_tasks = [self.search_posts(term) for term in terms]
-            search_results = await asyncio.gather(*trend_tasks)
+            search_results = planner.results_for(terms)
+            seen_uris = set()
 
             hashtag_frequency = {}
             post_metrics = {
@@ -291,11 +536,18 @@ class BlueskyAdvancedCrawler:
 
             for results in search_results:
                 for post in results:
+                    # A post matching several of the category's terms counts once
+                    returned += 1
+                    if post.uri in seen_uris:
+                        continue
+                    seen_uris.add(post.uri)
+                    counted += 1
+
                     post_metrics['total_posts'] += 1
-                    post_metrics['average_likes'] += post['likes']
+                    post_metrics['average_likes'] += post.likes
                     post_metrics['top_posts'].append(post)
 
-                    for hashtag in post['hashtags']:
+                    for hashtag in post.hashtags:
                         hashtag_frequency[hashtag] = hashtag_frequency.get(hashtag, 0) + 1
 
             # Calculate metrics
@@ -320,18 +572,27 @@ class BlueskyAdvancedCrawler:
                     }
                     for hashtag, count in sorted_hashtags
                 ],
+                'hashtag_windows': self.trend_engine.top_all(category),
                 'post_metrics': {
                     'total_posts': post_metrics['total_posts'],
                     'average_likes': round(post_metrics['average_likes'], 2),
-                    'top_posts': sorted(
-                        post_metrics['top_posts'],
-                        key=lambda x: x['likes'],
-                        reverse=True
-                    )[:50]
+                    # The summary is written as JSON, so convert only the posts it keeps
+                    'top_posts': [
+                        post.to_dict() for post in sorted(
+                            post_metrics['top_posts'],
+                            key=lambda x: x.likes,
+                            reverse=True
+                        )[:50]
+                    ]
                 }
             }
 
+        logger.info(
+            f"Trend dedupe: counted {counted} of {returned} returned posts, "
+            f"skipped {returned - counted} duplicate metric and hashtag updates"
+        )
         logger.info("Completed trend analysis")
+        await asyncio.to_thread(self.trend_engine.save, self.trend_engine_path)
         await self.save_trend_analysis(trend_analysis)
         return trend_analysis
 
@@ -342,10 +603,25 @@ class BlueskyAdvancedCrawler:
         os.makedirs(trend_store_path, exist_ok=True)
         logger.info(f"Trend analysis store path: {trend_store_path}")
 
+        snapshot_time = datetime.now(timezone.utc).isoformat()
+
         async def save_category(category, data):
             try:
-                async with aiofiles.open(self.categories['trends'][category], 'w') as f:
+                # Write beside the target and rename, so readers never see a partial file
+                path = self.categories['trends'][category]
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                async with aiofiles.open(f'{path}.tmp', 'w') as f:
                     await f.write(json.dumps(data, indent=2))
+                os.replace(f'{path}.tmp', path)
+                for callback in self.trend_subscribers:
+                    try:
+                        callback(category, data)
+                    except Exception as e:
+                        logger.error(f'Trend subscriber failed for {category}: {e}')
+
+                # Keep every cycle's summary as history
+                snapshot = {'category': category, 'created_at': snapshot_time, **data}
+                await asyncio.to_thread(self.post_store.append, 'trend_snapshots', [snapshot])
                 logger.info(f'Saved trend analysis for {category}')
             except Exception as e:
                 logger.error(f'Error saving {category} trend data: {e}')
@@ -0,0 +1,123 @@
+"""
+Single process that chains the crawler into trend analysis and posting.
+
+    python daemon.py
+
+Replaces running crawler.py and analysis_api.py as two independent loops.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict
+
+from analysis_api import BlueskyPoster, TrendAnalyzer
+from analysis_pipeline import analyze_and_post, make_cpu_pool
+from analysis_store import store
+from crawler import BlueskyAdvancedCrawler
+from model_registry import registry
+
+logger = logging.getLogger(__name__)
+
+
+class TrendDaemon:
+    """
+    Crawl on a fixed interval and analyze each category as soon as its trend
+    summary is ready.
+
+    Summaries pass from the crawler to the analysis workers through a bounded
+    in-memory queue holding at most one entry per category: a newer summary for
+    a category still waiting replaces the older one rather than queueing behind
+    it. The crawler's trend files remain on disk only as a checkpoint. A burst
+    detected during ingestion forces fresh insights for that category's next
+    analysis instead of reusing the previous ones.
+    """
+
+    def __init__(self, crawler: BlueskyAdvancedCrawler, analyzer: TrendAnalyzer, poster: BlueskyPoster,
+                 crawl_interval: float = 30 * 60):
+        self.crawler = crawler
+        self.analyzer = analyzer
+        self.poster = poster
+        self.crawl_interval = crawl_interval
+        self.categories = list(crawler.TREND_CATEGORIES)
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=len(self.categories))
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.forced = set()
+        self.cpu_pool = make_cpu_pool(self.categories)
+        self.post_lock = asyncio.Lock()
+
+        crawler.subscribe_trends(self.enqueue)
+        crawler.burst_detector.subscribe(self.on_burst)
+
+    def enqueue(self, category: str, data: Dict[str, Any]):
+        """Hand a saved trend summary to the analysis workers"""
+        waiting = category in self.latest
+        self.latest[category] = data
+        if waiting:
+            logger.info(f"Replaced the queued {category} summary with a newer one")
+            return
+        try:
+            self.queue.put_nowait(category)
+        except asyncio.QueueFull:
+            del self.latest[category]
+            logger.warning(f"Analysis queue full; dropped {category} summary")
+
+    def on_burst(self, event: Dict[str, Any]):
+        if event['category'] in self.categories and event['category'] not in self.forced:
+            self.forced.add(event['category'])
+            logger.info(f"Burst in {event['category']}; its next analysis will generate fresh insights")
+
+    async def analyze(self):
+        """Worker: analyze and post categories as they arrive on the queue"""
+        while True:
+            category = await self.queue.get()
+            try:
+                data = self.latest.pop(category)
+                force = category in self.forced
+                self.forced.discard(category)
+                started = time.perf_counter()
+                await analyze_and_post(
+                    self.analyzer, self.poster, category, self.cpu_pool, self.post_lock,
+                    trend_data=data, force=force
+                )
+                logger.info(f"Analyzed {category} in {time.perf_counter() - started:.1f}s")
+            finally:
+                self.queue.task_done()
+
+    async def run(self):
+        await self.crawler.authenticate()
+        workers = [asyncio.create_task(self.analyze()) for _ in self.categories]
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    await self.crawler.crawl_financial_content()
+                except Exception as e:
+                    logger.error(f'Crawl cycle error: {e}')
+
+                registry.unload_idle()
+                logger.info(f"Models: {registry.report()}")
+                logger.info(f"Insight reuse: {self.analyzer.change_detector.report()}")
+                io = store.take_stats()
+                logger.info(f"Analysis I/O since last cycle: {io['bytes_read']} bytes read, {io['bytes_written']} bytes written")
+                await asyncio.sleep(max(0.0, self.crawl_interval - (time.monotonic() - started)))
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.cpu_pool.shutdown(wait=False)
+
+
+async def main():
+    logger.info("Starting trend daemon")
+    daemon = TrendDaemon(
+        BlueskyAdvancedCrawler(),
+        TrendAnalyzer(),
+        BlueskyPoster(),
+        crawl_interval=float(os.getenv('DAEMON_CRAWL_INTERVAL', 30 * 60))
+    )
+    await daemon.run()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+import hashlib
+import math
+
+
+class RollingBloomFilter:
+    """
+    Approximate seen-set with bounded memory for cross-cycle deduplication.
+
+    Two generations of bits are kept; once the current one holds ``capacity``
+    keys it becomes the previous one and a fresh generation starts. A key is
+    therefore remembered for at least ``capacity`` later insertions, and memory
+    stays fixed at two bit arrays sized for the target false-positive rate.
+    """
+
+    def __init__(self, capacity: int = 200_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+        self.current = bytearray((self.size + 7) // 8)
+        self.previous = bytearray((self.size + 7) // 8)
+        self.current_count = 0
+
+    def _positions(self, key: str):
+        # Double hashing from one 16-byte digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    @staticmethod
+    def _contains(bits: bytearray, positions) -> bool:
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return self._contains(self.current, positions) or self._contains(self.previous, positions)
+
+    def add(self, key: str) -> bool:
+        """Insert key; returns True if it was (probably) already present"""
+        positions = self._positions(key)
+        if self._contains(self.current, positions):
+            return True
+        seen = self._contains(self.previous, positions)
+
+        if self.current_count >= self.capacity:
+            self.previous = self.current
+            self.current = bytearray(len(self.previous))
+            self.current_count = 0
+        for position in positions:
+            self.current[position >> 3] |= 1 << (position & 7)
+        self.current_count += 1
+        return seen
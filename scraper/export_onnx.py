@@ -0,0 +1,109 @@
+"""
+Export the FinBERT sentiment model to ONNX with dynamic int8 quantization.
+
+    python export_onnx.py [--model ProsusAI/finbert] [--output models/finbert-int8]
+                          --heldout texts.txt [--min-agreement 0.95]
+
+The output directory holds model.onnx plus the tokenizer and config, and is
+what SENTIMENT_ONNX_PATH points at when SENTIMENT_BACKEND=onnx. After export
+the quantized model is scored against the PyTorch model on the held-out texts
+in --heldout, one per line. Use a fixed set kept apart from production data
+(not the crawler's own trend files) so runs stay comparable. The command
+exits non-zero if label agreement is below --min-agreement.
+"""
+import argparse
+import inspect
+import logging
+import os
+import sys
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from sentiment import OnnxSentimentScorer, SentimentScorer
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def export(model_name: str, output_dir: str, keep_fp32: bool = False):
+    """Write model.onnx (int8) plus tokenizer and config to output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    fp32_path = os.path.join(output_dir, 'model-fp32.onnx')
+    dummy = tokenizer(['Markets rallied today'], return_tensors='pt')
+    # The tracing exporter takes dynamic_axes; newer torch defaults to the dynamo exporter instead
+    legacy = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    # Tracing breaks on inference-mode tensors, so only disable autograd
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy['input_ids'], dummy['attention_mask']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'}
+            },
+            opset_version=14,
+            **legacy
+        )
+
+    quantize_dynamic(fp32_path, os.path.join(output_dir, 'model.onnx'), weight_type=QuantType.QInt8)
+    if not keep_fp32:
+        os.remove(fp32_path)
+
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    logger.info(
+        f"Exported {model_name} to {output_dir} "
+        f"({os.path.getsize(os.path.join(output_dir, 'model.onnx')) / 2**20:.0f} MB int8)"
+    )
+
+
+def load_heldout(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def verify(model_name: str, output_dir: str, texts, max_length: int) -> float:
+    """Share of held-out texts where the int8 model picks the PyTorch model's label"""
+    reference = SentimentScorer(model_name, max_length=max_length, batch_size=16).score(texts)
+    quantized = OnnxSentimentScorer(output_dir, max_length=max_length, batch_size=16).score(texts)
+    agreement = sum(a['label'] == b['label'] for a, b in zip(reference, quantized)) / len(texts)
+    logger.info(f"Label agreement with PyTorch on {len(texts)} held-out texts: {agreement * 100:.1f}%")
+    return agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--output', default=os.path.join(SCRAPER_DIR, 'models', 'finbert-int8'))
+    parser.add_argument('--max-length', type=int, default=128)
+    parser.add_argument('--heldout', required=True, help='Text file with one held-out post per line')
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    parser.add_argument('--keep-fp32', action='store_true', help='Keep the unquantized export as well')
+    args = parser.parse_args()
+
+    # Read the held-out set first, so a bad path fails before the slow export
+    texts = load_heldout(args.heldout)
+    if not texts:
+        parser.error(f'{args.heldout} has no held-out texts')
+
+    export(args.model, args.output, args.keep_fp32)
+
+    if verify(args.model, args.output, texts, args.max_length) < args.min_agreement:
+        logger.error(f"Agreement is below {args.min_agreement * 100:.0f}%; do not switch SENTIMENT_BACKEND to onnx")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
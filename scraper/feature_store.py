@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def post_key(post: Dict[str, Any]) -> str:
+    """Post URI, or a hash of the text for trend files written before URIs were stored"""
+    return post.get('uri') or hashlib.sha1(post['text'].encode('utf-8')).hexdigest()
+
+
+class FeatureStore:
+    """
+    SQLite cache of per-post analysis features, keyed by post URI.
+
+    Holds the FinBERT label and score, the hashed term vector and the hashtags of
+    every post analyzed so far. Each cycle only posts missing from the store are
+    scored; the rest are read back, and sentiment rankings are queried from the
+    store. Rows record the sentiment model that scored them (``model_id``); rows
+    from another model count as missing. Rows not seen for ``max_age`` seconds
+    are pruned.
+    """
+
+    PRUNE_INTERVAL = 60 * 60
+
+    def __init__(self, path: str, model_id: str, max_age: float = 7 * 24 * 60 * 60):
+        self.path = path
+        self.model_id = model_id
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            '''CREATE TABLE IF NOT EXISTS post_features (
+                uri TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                vector_indices BLOB NOT NULL,
+                vector_values BLOB NOT NULL,
+                hashtags TEXT NOT NULL,
+                seen_at REAL NOT NULL,
+                model TEXT NOT NULL DEFAULT ''
+            )'''
+        )
+        columns = {row[1] for row in self.connection.execute('PRAGMA table_info(post_features)')}
+        if 'model' not in columns:
+            # Stores created before rows recorded their model; those rows get rescored
+            self.connection.execute("ALTER TABLE post_features ADD COLUMN model TEXT NOT NULL DEFAULT ''")
+        self.connection.commit()
+        self.last_pruned = 0.0
+
+    def features(
+        self,
+        posts: List[Dict[str, Any]],
+        compute: Callable[[List[str]], Tuple[List[Dict[str, Any]], csr_matrix]],
+        n_features: int
+    ) -> Tuple[List[str], csr_matrix, int]:
+        """
+        Keys and term vectors for posts, in order, computing features only for new posts.
+
+        ``compute`` receives the new texts and returns their sentiment results and
+        hashed vectors. Returns the post keys, the stacked vectors and the number of
+        posts that had to be computed.
+        """
+        keys = [post_key(post) for post in posts]
+        now = time.time()
+        with self.lock:
+            cached = self._load_vectors(keys)
+
+        new = [(key, post) for key, post in zip(keys, posts) if key not in cached]
+        if new:
+            sentiments, vectors = compute([post['text'] for _, post in new])
+            rows = []
+            for i, (key, post) in enumerate(new):
+                row = vectors.getrow(i)
+                cached[key] = (row.indices.astype(np.int32), row.data.astype(np.float32))
+                hashtags = post.get('hashtags') or re.findall(r'#(\w+)', post['text'])
+                rows.append((
+                    key, post['text'], sentiments[i]['label'], sentiments[i]['score'],
+                    cached[key][0].tobytes(), cached[key][1].tobytes(), json.dumps(hashtags), now, self.model_id
+                ))
+            with self.lock:
+                self.connection.executemany(
+                    '''INSERT OR REPLACE INTO post_features
+                       (uri, text, sentiment, confidence, vector_indices, vector_values, hashtags, seen_at, model)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    rows
+                )
+                self.connection.commit()
+
+        with self.lock:
+            self.connection.executemany('UPDATE post_features SET seen_at = ? WHERE uri = ?', [(now, key) for key in keys])
+            self.connection.commit()
+            self._prune(now)
+
+        indptr = np.cumsum([0] + [len(cached[key][0]) for key in keys])
+        indices = np.concatenate([cached[key][0] for key in keys]) if keys else np.array([], dtype=np.int32)
+        values = np.concatenate([cached[key][1] for key in keys]) if keys else np.array([], dtype=np.float32)
+        return keys, csr_matrix((values, indices, indptr), shape=(len(keys), n_features)), len(new)
+
+    def _load_vectors(self, keys: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        vectors = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            cursor = self.connection.execute(
+                f'''SELECT uri, vector_indices, vector_values FROM post_features
+                    WHERE model = ? AND uri IN ({",".join("?" * len(chunk))})''',
+                [self.model_id, *chunk]
+            )
+            for uri, indices, values in cursor:
+                vectors[uri] = (np.frombuffer(indices, dtype=np.int32), np.frombuffer(values, dtype=np.float32))
+        return vectors
+
+    def top_sentiment(self, keys: List[str], label: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Most confident posts with the given label among keys"""
+        if not keys:
+            return []
+        with self.lock:
+            cursor = self.connection.execute(
+                f'''SELECT text, sentiment, confidence FROM post_features
+                    WHERE sentiment = ? AND uri IN ({",".join("?" * len(keys))})
+                    ORDER BY confidence DESC LIMIT ?''',
+                [label, *keys, limit]
+            )
+            return [{'text': text, 'sentiment': sentiment, 'confidence': confidence} for text, sentiment, confidence in cursor]
+
+    def _prune(self, now: float):
+        if now - self.last_pruned < self.PRUNE_INTERVAL:
+            return
+        self.connection.execute('DELETE FROM post_features WHERE seen_at < ?', (now - self.max_age,))
+        self.connection.commit()
+        self.last_pruned = now
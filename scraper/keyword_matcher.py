@@ -0,0 +1,83 @@
+import re
+import string
+from typing import Dict, FrozenSet, Iterable, List
+
+EMPTY: FrozenSet[str] = frozenset()
+
+
+class KeywordMatcher:
+    """
+    Tag text with every category whose keywords it contains.
+
+    Matching is on whole words, so 'stock' matches 'stocks' and '#stock' but not
+    'livestock' or 'marketing'. Keywords may take a plural suffix; list other word
+    forms explicitly in the table. Multi-word keywords match the same words
+    separated by single spaces or punctuation.
+
+    Texts are lowercased, encoded and joined with a 0xff byte (which never occurs
+    in UTF-8), ASCII punctuation and whitespace are blanked with one
+    bytes.translate, and one alternation regex over every category's keywords
+    scans each batch of texts. The regex starts with a literal space, which the
+    engine skips to quickly, and Python only runs once per keyword hit and per
+    text rather than per word, so ``match_many`` is the fast path.
+    """
+
+    SEPARATOR = b'\xff'
+    # Texts joined per scan; large enough to amortize the per-call cost, small enough to stay in cache
+    BATCH_SIZE = 1000
+    BLANKED = ''.join(char for char in string.punctuation if char != '_') + string.whitespace
+    BLANK_PUNCTUATION = bytes.maketrans(BLANKED.encode(), b' ' * len(BLANKED))
+
+    def __init__(self, table: Dict[str, Iterable[str]]):
+        # keyword, normalized like the texts -> categories
+        categories: Dict[bytes, set] = {}
+        for category, keywords in table.items():
+            for keyword in keywords:
+                normalized = b' '.join(keyword.lower().encode('utf-8').translate(self.BLANK_PUNCTUATION).split())
+                if normalized:
+                    categories.setdefault(normalized, set()).add(category)
+        # A match consumes its words, so a phrase also carries the categories of keywords inside it
+        self.keyword_categories: Dict[bytes, FrozenSet[str]] = {
+            keyword: frozenset().union(*(
+                matched for inner, matched in categories.items()
+                if re.search(rb' ' + re.escape(inner) + rb'(?:e?s)? ', b' ' + keyword + b' ')
+            ))
+            for keyword in categories
+        }
+
+        # Longest keyword first, so 'cryptocurrency' wins over 'crypto'. Keywords are matched in a
+        # lookahead, so overlapping phrases starting at later words still match; an empty match
+        # is a separator between texts
+        alternation = b'|'.join(re.escape(keyword) for keyword in sorted(self.keyword_categories, key=len, reverse=True))
+        self.pattern = re.compile(
+            rb' (?:' + re.escape(self.SEPARATOR) + rb'|(?=(' + (alternation or rb'(?!)') + rb')(?:e?s)? ))'
+        )
+
+    def match_many(self, texts: Iterable[str]) -> List[FrozenSet[str]]:
+        """Return the categories matched by each text, scanning them in batches"""
+        texts = list(texts)
+        results = []
+        for start in range(0, len(texts), self.BATCH_SIZE):
+            results.extend(self._match_batch(texts[start:start + self.BATCH_SIZE]))
+        return results
+
+    def _match_batch(self, texts: List[str]) -> List[FrozenSet[str]]:
+        joined = (b' ' + self.SEPARATOR + b' ').join(map(str.encode, map(str.lower, texts)))
+        data = b' ' + joined.translate(self.BLANK_PUNCTUATION) + b' '
+
+        results = []
+        matched = EMPTY
+        for keyword in self.pattern.findall(data):
+            if not keyword:
+                results.append(matched)
+                matched = EMPTY
+            elif matched:
+                matched = matched | self.keyword_categories[keyword]
+            else:
+                matched = self.keyword_categories[keyword]
+        results.append(matched)
+        return results
+
+    def match(self, text: str) -> FrozenSet[str]:
+        """Return all categories matched by text"""
+        return self.match_many([text])[0]
@@ -0,0 +1,119 @@
+import gc
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB, where /proc is available"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Process-lifetime cache of heavy models and clients.
+
+    Models are registered with a loader and built on first ``get``, then kept
+    warm across workflow cycles. ``unload_idle`` drops any model unused for
+    ``idle_timeout`` seconds; the next ``get`` loads it again.
+
+    Each model has its own load lock, so a slow load only blocks callers of
+    that model; the registry lock is never held while a loader runs.
+    """
+
+    def __init__(self, idle_timeout: float = 2 * 60 * 60):
+        self.idle_timeout = idle_timeout
+        self.loaders: Dict[str, Callable[[], Any]] = {}
+        self.models: Dict[str, Any] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.load_locks: Dict[str, threading.Lock] = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register a loader; an existing registration under the same name is kept"""
+        with self.lock:
+            self.loaders.setdefault(name, loader)
+            self.load_locks.setdefault(name, threading.Lock())
+            self.stats.setdefault(name, {'loads': 0, 'load_seconds': None, 'rss_mb': None, 'last_used': None})
+
+    def _cached(self, name: str) -> Any:
+        """The loaded model, marked as used, or None; call with the registry lock held"""
+        model = self.models.get(name)
+        if model is not None:
+            self.stats[name]['last_used'] = time.monotonic()
+        return model
+
+    def get(self, name: str) -> Any:
+        with self.lock:
+            model = self._cached(name)
+            load_lock = self.load_locks[name]
+        if model is not None:
+            return model
+
+        with load_lock:
+            # Another caller may have loaded it while this one waited
+            with self.lock:
+                model = self._cached(name)
+            if model is not None:
+                return model
+
+            # RSS is process-wide, so a load running alongside another one inflates its delta
+            rss_before = current_rss_mb()
+            start = time.perf_counter()
+            model = self.loaders[name]()
+            load_seconds = round(time.perf_counter() - start, 2)
+            rss_after = current_rss_mb()
+
+            with self.lock:
+                stats = self.stats[name]
+                self.models[name] = model
+                stats['load_seconds'] = load_seconds
+                if rss_before is not None and rss_after is not None:
+                    stats['rss_mb'] = round(rss_after - rss_before, 1)
+                stats['loads'] += 1
+                stats['last_used'] = time.monotonic()
+            logger.info(f"Loaded model {name} in {stats['load_seconds']}s ({stats['rss_mb']} MB)")
+            return model
+
+    def unload_idle(self) -> int:
+        """Drop models unused for longer than idle_timeout; returns the number unloaded"""
+        now = time.monotonic()
+        with self.lock:
+            idle = [
+                name for name in self.models
+                if now - self.stats[name]['last_used'] > self.idle_timeout
+            ]
+            for name in idle:
+                del self.models[name]
+                logger.info(f"Unloaded idle model {name}")
+        if idle:
+            gc.collect()
+        return len(idle)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per model: loaded, load count, last load time, RSS added by the last load, idle seconds"""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                name: {
+                    'loaded': name in self.models,
+                    'loads': stats['loads'],
+                    'load_seconds': stats['load_seconds'],
+                    'rss_mb': stats['rss_mb'],
+                    'idle_seconds': round(now - stats['last_used']) if stats['last_used'] is not None else None
+                }
+                for name, stats in self.stats.items()
+            }
+
+
+# Shared by every analyzer and poster in the process
+registry = ModelRegistry(idle_timeout=float(os.getenv('MODEL_IDLE_TIMEOUT', 2 * 60 * 60)))
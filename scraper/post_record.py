@@ -0,0 +1,48 @@
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable
+
+from timeparse import parse_created_at
+
+
+class PostRecord:
+    """
+    Compact in-memory post used throughout the crawl pipeline.
+
+    ``created_at`` is parsed once into epoch seconds and hashtags are interned
+    tuples, so the same post can sit in several category lists cheaply. Convert
+    with ``to_dict`` / ``from_dict`` only where posts are written or read as JSON.
+    """
+
+    __slots__ = ('uri', 'text', 'created_at', 'likes', 'hashtags')
+
+    def __init__(self, uri: str, text: str, created_at: int, likes: int, hashtags: Iterable[str]):
+        self.uri = uri
+        self.text = text
+        self.created_at = created_at
+        self.likes = likes
+        self.hashtags = tuple(sys.intern(hashtag) for hashtag in hashtags)
+
+    @classmethod
+    def create(cls, uri: str, text: str, created_at: str, likes: int, hashtags: Iterable[str]) -> 'PostRecord':
+        """Build a record from API values, parsing the ISO timestamp"""
+        return cls(uri, text, int(parse_created_at(created_at).timestamp()), likes or 0, hashtags)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PostRecord':
+        created_at = data['created_at']
+        if isinstance(created_at, str):
+            created_at = int(parse_created_at(created_at).timestamp())
+        return cls(data['uri'], data['text'], created_at, data.get('likes') or 0, data.get('hashtags', ()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'uri': self.uri,
+            'text': self.text,
+            'created_at': datetime.fromtimestamp(self.created_at, timezone.utc).isoformat(),
+            'likes': self.likes,
+            'hashtags': list(self.hashtags)
+        }
+
+    def __repr__(self):
+        return f'PostRecord(uri={self.uri!r}, created_at={self.created_at}, likes={self.likes})'
@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List
+
+from timeparse import parse_created_at
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class PostStore:
+    """
+    Append-only post storage, partitioned by category and hour.
+
+    Each append writes a new newline-delimited JSON part file (optionally zstd
+    compressed) under ``<root>/<category>/<YYYY-MM-DDTHH>/`` and publishes it with
+    an atomic rename, so readers never see a half-written file. Older hours are
+    compacted into a single part, dropping duplicate URIs.
+    """
+
+    HOUR_FORMAT = '%Y-%m-%dT%H'
+
+    def __init__(self, root: str, compress: bool = False):
+        self.root = root
+        if compress and zstandard is None:
+            logger.warning("zstandard is not installed, writing uncompressed parts")
+            compress = False
+        self.compress = compress
+
+    @staticmethod
+    def _hour_of(record: Dict[str, Any]) -> datetime:
+        created_at = parse_created_at(record['created_at'])
+        return created_at.replace(minute=0, second=0, microsecond=0)
+
+    def _partition_dir(self, category: str, hour: datetime) -> str:
+        return os.path.join(self.root, category, hour.strftime(self.HOUR_FORMAT))
+
+    def _write_part(self, directory: str, records: List[Dict[str, Any]], prefix: str = 'part') -> str:
+        os.makedirs(directory, exist_ok=True)
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        suffix = '.ndjson'
+        if self.compress:
+            data = zstandard.ZstdCompressor(level=3).compress(data)
+            suffix += '.zst'
+
+        name = f'{prefix}-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}{suffix}'
+        tmp_path = os.path.join(directory, f'.{name}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        path = os.path.join(directory, name)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _read_part(path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        for line in data.decode('utf-8').splitlines():
+            if line:
+                yield json.loads(line)
+
+    @staticmethod
+    def _parts(directory: str) -> List[str]:
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            os.path.join(directory, name) for name in names
+            if not name.startswith('.') and (name.endswith('.ndjson') or name.endswith('.ndjson.zst'))
+        )
+
+    def _read_partition(self, directory: str) -> Iterator[Dict[str, Any]]:
+        """Records from every part of a partition, following a compaction that runs meanwhile"""
+        read = set()
+        pending = self._parts(directory)
+        while pending:
+            path = pending.pop(0)
+            read.add(path)
+            try:
+                records = list(self._read_part(path))
+            except FileNotFoundError:
+                # compact publishes the merged part before removing the old ones, so list again
+                pending = [path for path in self._parts(directory) if path not in read]
+                continue
+            yield from records
+
+    def append(self, category: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Append records to their hour partitions; returns the number written"""
+        by_hour: Dict[datetime, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_hour.setdefault(self._hour_of(record), []).append(record)
+
+        for hour, hour_records in by_hour.items():
+            self._write_part(self._partition_dir(category, hour), hour_records)
+        return sum(len(hour_records) for hour_records in by_hour.values())
+
+    def load_range(self, category: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Load a category's records created in [start, end), one copy per URI"""
+        records = []
+        seen = set()
+        hour = start.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        while hour < end:
+            # Only partitions straddling the range edges need a per-record time check
+            inside = start <= hour and hour + timedelta(hours=1) <= end
+            for record in self._read_partition(self._partition_dir(category, hour)):
+                key = record.get('uri')
+                if key and key in seen:
+                    continue
+                if inside or start <= parse_created_at(record['created_at']) < end:
+                    if key:
+                        seen.add(key)
+                    records.append(record)
+            hour += timedelta(hours=1)
+        return records
+
+    def compact(self, older_than: timedelta = timedelta(hours=1)) -> int:
+        """Merge the parts of each closed hour into one; returns the number of partitions compacted"""
+        cutoff = (datetime.now(timezone.utc) - older_than).strftime(self.HOUR_FORMAT)
+        compacted = 0
+        if not os.path.isdir(self.root):
+            return compacted
+
+        for category in os.listdir(self.root):
+            category_dir = os.path.join(self.root, category)
+            if not os.path.isdir(category_dir):
+                continue
+            for hour_name in os.listdir(category_dir):
+                parts = self._parts(os.path.join(category_dir, hour_name))
+                if hour_name >= cutoff or len(parts) < 2:
+                    continue
+
+                records = {}
+                for path in parts:
+                    for record in self._read_part(path):
+                        records[record.get('uri') or len(records)] = record
+
+                # Publish the merged part before removing the old ones; load_range dedupes the overlap
+                # and picks up the merged part if one it listed is removed under it
+                self._write_part(os.path.join(category_dir, hour_name), list(records.values()), prefix='compacted')
+                for path in parts:
+                    os.remove(path)
+                compacted += 1
+
+        if compacted:
+            logger.info(f"Compacted {compacted} hour partitions")
+        return compacted
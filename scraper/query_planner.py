@@ -0,0 +1,50 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+class QueryPlanner:
+    """
+    Run each distinct search term once per crawl cycle and share the results.
+
+    Consumers register the terms they need; the planner searches the union once
+    and hands every consumer the cached results for its own terms.
+    """
+
+    def __init__(self, search: Callable[[str], Awaitable[List[Dict[str, Any]]]]):
+        self.search = search
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self.requested = 0
+
+    @staticmethod
+    def normalize(term: str) -> str:
+        return ' '.join(term.lower().split())
+
+    async def run(self, *term_groups: Iterable[str]):
+        """Search the union of all term groups, skipping terms already fetched this cycle"""
+        unique_terms = []
+        for terms in term_groups:
+            for term in terms:
+                self.requested += 1
+                term = self.normalize(term)
+                if term not in self.results and term not in unique_terms:
+                    unique_terms.append(term)
+
+        search_results = await asyncio.gather(*[self.search(term) for term in unique_terms])
+        self.results.update(zip(unique_terms, search_results))
+
+        logger.info(
+            f"Query planner: {self.requested} searches requested, {len(self.results)} issued, "
+            f"{self.requested - len(self.results)} API calls saved"
+        )
+
+    def results_for(self, terms: Iterable[str]) -> List[List[Dict[str, Any]]]:
+        """Cached results for each distinct term, in first-seen order"""
+        seen = []
+        for term in terms:
+            term = self.normalize(term)
+            if term in self.results and term not in seen:
+                seen.append(term)
+        return [self.results[term] for term in seen]
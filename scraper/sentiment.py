@@ -0,0 +1,167 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import numpy as np
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentScorer:
+    """
+    Batched FinBERT scoring.
+
+    Texts are tokenized once with truncation, sorted by token length and run in
+    batches padded only to the longest text of each batch, so short posts do not
+    pay for long ones. Results come back in input order. Unless a batch size is
+    given, the first call times a few sizes on this host and keeps the fastest.
+    Calls are serialized: the fast tokenizer and the calibration state are not
+    safe to share between threads, and the model already uses every core.
+
+    This class runs the PyTorch model; ``OnnxSentimentScorer`` runs an exported
+    int8 model through onnxruntime. ``from_env`` picks one from SENTIMENT_BACKEND.
+    """
+
+    CALIBRATION_SIZES = (1, 8, 16, 32)
+    CALIBRATION_TEXTS = 64
+
+    def __init__(self, model_name: str = 'ProsusAI/finbert', max_length: int = 128, batch_size: Optional[int] = None):
+        self.model_name = model_name
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        config = AutoConfig.from_pretrained(model_name)
+        self.labels = [config.id2label[i] for i in range(config.num_labels)]
+        self._load_model()
+
+    @staticmethod
+    def _env_settings(model_name: str):
+        """Backend, model name or directory, and max length selected by the environment"""
+        max_length = int(os.getenv('SENTIMENT_MAX_LENGTH', 128))
+        if os.getenv('SENTIMENT_BACKEND', 'torch').lower() == 'onnx':
+            onnx_path = os.getenv('SENTIMENT_ONNX_PATH', os.path.join(os.path.dirname(__file__), 'models', 'finbert-int8'))
+            return 'onnx', onnx_path, max_length
+        return 'torch', model_name, max_length
+
+    @staticmethod
+    def model_id_from_env(model_name: str = 'ProsusAI/finbert') -> str:
+        """Identifies whatever from_env would load, without loading it; cached labels are keyed by it"""
+        backend, name, max_length = SentimentScorer._env_settings(model_name)
+        return f'{backend}:{name}:{max_length}'
+
+    @staticmethod
+    def from_env(model_name: str = 'ProsusAI/finbert') -> 'SentimentScorer':
+        """Build the scorer selected by SENTIMENT_BACKEND ('torch' or 'onnx')"""
+        backend, name, max_length = SentimentScorer._env_settings(model_name)
+        batch_size = os.getenv('SENTIMENT_BATCH_SIZE')
+        options = {
+            'max_length': max_length,
+            'batch_size': int(batch_size) if batch_size else None
+        }
+        if backend == 'onnx':
+            return OnnxSentimentScorer(
+                name,
+                threads=int(os.getenv('SENTIMENT_ONNX_THREADS', os.cpu_count() or 1)),
+                **options
+            )
+        return SentimentScorer(name, **options)
+
+    def _load_model(self):
+        if torch is None:
+            raise RuntimeError("torch is required for the PyTorch sentiment backend")
+        self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        self.model.eval()
+
+    def _encode(self, texts: Sequence[str]) -> List[List[int]]:
+        return self.tokenizer(list(texts), truncation=True, max_length=self.max_length)['input_ids']
+
+    def _forward(self, batch_ids: List[List[int]]) -> List[List[float]]:
+        """Class probabilities for one batch, padded to its longest sequence"""
+        padded = self.tokenizer.pad({'input_ids': batch_ids}, return_tensors='pt')
+        with torch.inference_mode():
+            logits = self.model(**padded).logits
+        return torch.softmax(logits, dim=-1).tolist()
+
+    def _run(self, input_ids: List[List[int]], batch_size: int) -> List[Dict[str, float]]:
+        order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+        results = [None] * len(input_ids)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            for index, probabilities in zip(chunk, self._forward([input_ids[i] for i in chunk])):
+                best = max(range(len(probabilities)), key=probabilities.__getitem__)
+                results[index] = {'label': self.labels[best], 'score': probabilities[best]}
+        return results
+
+    def calibrate(self, input_ids: List[List[int]]) -> int:
+        """Time each candidate batch size on a sample of real inputs and keep the fastest"""
+        sample = (input_ids * (self.CALIBRATION_TEXTS // len(input_ids) + 1))[:self.CALIBRATION_TEXTS]
+        self._run(sample[:8], 8)  # warm-up
+
+        rates = {}
+        for size in self.CALIBRATION_SIZES:
+            start = time.perf_counter()
+            self._run(sample, size)
+            rates[size] = len(sample) / (time.perf_counter() - start)
+
+        self.batch_size = max(rates, key=rates.get)
+        logger.info(
+            f"Sentiment batch size {self.batch_size} selected "
+            f"({', '.join(f'{size}: {rate:.0f} posts/s' for size, rate in rates.items())})"
+        )
+        return self.batch_size
+
+    def score(self, texts: Sequence[str], batch_size: Optional[int] = None) -> List[Dict[str, float]]:
+        """Top label and its probability for each text, in input order"""
+        if not texts:
+            return []
+        with self.lock:
+            input_ids = self._encode(texts)
+            if batch_size is None:
+                batch_size = self.batch_size or self.calibrate(input_ids)
+            return self._run(input_ids, batch_size)
+
+
+class OnnxSentimentScorer(SentimentScorer):
+    """
+    SentimentScorer backed by an int8 ONNX export (see export_onnx.py).
+
+    ``model_dir`` holds model.onnx plus the tokenizer and config saved beside it.
+    Batching, truncation and output are the same as the PyTorch scorer.
+    """
+
+    def __init__(self, model_dir: str, max_length: int = 128, batch_size: Optional[int] = None, threads: int = 1):
+        self.threads = threads
+        super().__init__(model_dir, max_length=max_length, batch_size=batch_size)
+
+    def _load_model(self):
+        if onnxruntime is None:
+            raise RuntimeError("onnxruntime is required for the ONNX sentiment backend")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self.threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(self.model_name, 'model.onnx'),
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def _forward(self, batch_ids: List[List[int]]) -> List[List[float]]:
+        padded = self.tokenizer.pad({'input_ids': batch_ids}, return_tensors='np')
+        logits = self.session.run(None, {name: padded[name].astype(np.int64) for name in self.input_names})[0]
+        exponents = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return (exponents / exponents.sum(axis=-1, keepdims=True)).tolist()
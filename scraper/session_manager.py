@@ -0,0 +1,152 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import time
+
+from atproto import SessionEvent, Session
+from atproto_client.exceptions import BadRequestError, LoginRequiredError, UnauthorizedError
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = logging.getLogger(__name__)
+
+# The router bot imports this module from scraper/ as well; it is the only copy.
+
+
+class SessionManager:
+    """
+    Persist a Bluesky session in an encrypted local file and reuse it across runs.
+
+    The client refreshes its access token 15 minutes before it expires on the next
+    request; every refresh is written back here, so restarts resume the same session.
+    A password login only happens when there is no usable session or on a real auth failure.
+
+    Clients logged in as the same handle share the session file, and a refresh by
+    one rotates the refresh token out from under the others. A forced login first
+    tries the saved session when it is not the one the client already holds, so
+    the other clients pick up the rotated session instead of each logging in again.
+    """
+
+    AUTH_ERROR_CODES = ('ExpiredToken', 'InvalidToken', 'AuthenticationRequired')
+
+    def __init__(self, handle, password, session_dir, secret=None):
+        self.handle = handle
+        self.password = password
+        self.session_path = os.path.join(session_dir, f'{handle}.session')
+        os.makedirs(session_dir, exist_ok=True)
+
+        # SESSION_ENCRYPTION_KEY is a Fernet key; without one, derive a key from the account password
+        secret = secret or os.getenv('SESSION_ENCRYPTION_KEY')
+        if secret:
+            key = secret.encode()
+        elif not password:
+            raise ValueError(
+                f'No password configured for {handle}; set the account password or SESSION_ENCRYPTION_KEY'
+            )
+        else:
+            derived = hashlib.pbkdf2_hmac('sha256', password.encode(), handle.encode(), 200_000)
+            key = base64.urlsafe_b64encode(derived)
+        self.fernet = Fernet(key)
+
+        self._registered_clients = set()
+
+    def load(self):
+        """Return the saved session string, or None if missing, unreadable or past its refresh token"""
+        try:
+            with open(self.session_path, 'rb') as f:
+                session_string = self.fernet.decrypt(f.read()).decode()
+        except FileNotFoundError:
+            return None
+        except InvalidToken:
+            logger.warning(f'Could not decrypt saved session at {self.session_path}, ignoring it')
+            return None
+
+        refresh_exp = Session.decode(session_string).refresh_jwt_payload.exp
+        if refresh_exp and refresh_exp < time.time():
+            logger.info('Saved session has an expired refresh token, ignoring it')
+            return None
+        return session_string
+
+    def save(self, session_string):
+        """Atomically write the encrypted session string, readable only by this user"""
+        tmp_path = f'{self.session_path}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.fernet.encrypt(session_string.encode()))
+        os.replace(tmp_path, self.session_path)
+
+    def _on_session_change(self, event, session):
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            self.save(session.encode())
+            logger.info(f'Saved Bluesky session ({event.value})')
+
+    async def _on_session_change_async(self, event, session):
+        self._on_session_change(event, session)
+
+    def _register(self, client):
+        if id(client) not in self._registered_clients:
+            # AsyncClient awaits its callbacks, so it gets a coroutine function
+            if asyncio.iscoroutinefunction(client.login):
+                client.on_session_change(self._on_session_change_async)
+            else:
+                client.on_session_change(self._on_session_change)
+            self._registered_clients.add(id(client))
+
+    def _saved_session(self, client, force):
+        """The saved session to try; on a forced login only if it differs from the client's own"""
+        session_string = self.load()
+        if force and session_string is not None:
+            try:
+                current = client.export_session_string()
+            except Exception:
+                current = None
+            if session_string == current:
+                return None
+        return session_string
+
+    @classmethod
+    def is_auth_error(cls, error):
+        """Whether an error means the session itself is no longer valid"""
+        if isinstance(error, (UnauthorizedError, LoginRequiredError)):
+            return True
+        if isinstance(error, BadRequestError) and error.response is not None:
+            content = error.response.content
+            return getattr(content, 'error', None) in cls.AUTH_ERROR_CODES
+        return False
+
+    async def login_async(self, client, force=False):
+        """Log an AsyncClient in from the saved session; force skips it if it is the one that failed"""
+        self._register(client)
+
+        session_string = self._saved_session(client, force)
+        if session_string:
+            try:
+                await client.login(session_string=session_string)
+                logger.info(f'Reused saved session for {self.handle}')
+                return
+            except Exception as e:
+                if not self.is_auth_error(e):
+                    raise
+                logger.info(f'Saved session rejected, logging in again: {e}')
+
+        await client.login(self.handle, self.password)
+        logger.info(f'Created new session for {self.handle}')
+
+    def login_sync(self, client, force=False):
+        """Log a synchronous Client in from the saved session; force skips it if it is the one that failed"""
+        self._register(client)
+
+        session_string = self._saved_session(client, force)
+        if session_string:
+            try:
+                client.login(session_string=session_string)
+                logger.info(f'Reused saved session for {self.handle}')
+                return
+            except Exception as e:
+                if not self.is_auth_error(e):
+                    raise
+                logger.info(f'Saved session rejected, logging in again: {e}')
+
+        client.login(self.handle, self.password)
+        logger.info(f'Created new session for {self.handle}')
@@ -0,0 +1,53 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+# Fallback for strings fromisoformat rejects on older Pythons: 'Z' suffix, 1-9 digit fractions
+_ISO_PATTERN = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})'
+    r'(?:[.,](\d+))?'
+    r'(Z|[+-]\d{2}:?\d{2})?$'
+)
+
+
+def _parse_with_regex(value: str) -> datetime:
+    match = _ISO_PATTERN.match(value.strip())
+    if not match:
+        raise ValueError(f"Time data '{value}' is not an ISO 8601 timestamp")
+
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    microsecond = int((fraction or '0')[:6].ljust(6, '0'))
+
+    tzinfo = timezone.utc
+    if offset and offset != 'Z':
+        sign = -1 if offset[0] == '-' else 1
+        digits = offset[1:].replace(':', '')
+        tzinfo = timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond, tzinfo)
+
+
+def parse_created_at(value: str) -> datetime:
+    """Parse an AT Protocol timestamp into a timezone-aware UTC datetime (naive input is taken as UTC)"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = _parse_with_regex(value)
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    if parsed.utcoffset():
+        return parsed.astimezone(timezone.utc)
+    return parsed
+
+
+def parse_created_at_bulk(values: Iterable[str]):
+    """
+    Vectorized parse for analysis jobs.
+
+    Returns a UTC pandas DatetimeIndex; unparseable entries become NaT.
+    Use ``.asi8 // 10**9`` for epoch seconds as a NumPy int64 array.
+    """
+    import pandas as pd
+
+    return pd.DatetimeIndex(pd.to_datetime(list(values), utc=True, format='ISO8601', errors='coerce'))
@@ -0,0 +1,107 @@
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+logger = logging.getLogger(__name__)
+
+
+class TopicClusterer:
+    """
+    Incremental topic clustering for one category, persisted across cycles.
+
+    Texts are hashed into a fixed feature space, so there is no vocabulary to
+    refit, and each cycle's posts update the same MiniBatchKMeans centroids with
+    ``partial_fit``. Topic ids therefore keep their meaning from one cycle to the
+    next. Hashing is one-way, so the term last seen at each feature index is kept
+    to label clusters with their top terms. Terms are taken from every text folded
+    in, since its vector may have been hashed earlier, by another category's
+    clusterer, and read back from the feature store.
+    """
+
+    N_FEATURES = 2 ** 16
+    TOP_TERMS = 8
+
+    def __init__(self, path: str, n_clusters: int = 3):
+        self.path = path
+        self.n_clusters = n_clusters
+        self.vectorizer = HashingVectorizer(
+            n_features=self.N_FEATURES, stop_words='english', alternate_sign=False, norm='l2', dtype=np.float32
+        )
+        self.analyzer = self.vectorizer.build_analyzer()
+        self.model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3, batch_size=256)
+        self.fitted = False
+        # feature index -> term
+        self.terms: Dict[int, str] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Could not load topic state from {self.path}: {e}")
+            return
+        if state.get('n_clusters') == self.n_clusters:
+            self.model = state['model']
+            self.terms = state['terms']
+            self.fitted = True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f'{self.path}.tmp', 'wb') as f:
+            pickle.dump({'n_clusters': self.n_clusters, 'model': self.model, 'terms': self.terms}, f)
+        os.replace(f'{self.path}.tmp', self.path)
+
+    def _remember_terms(self, texts: List[str]):
+        for text in texts:
+            for term in self.analyzer(text):
+                # Same index HashingVectorizer assigns to the term
+                self.terms[abs(murmurhash3_32(term, seed=0)) % self.N_FEATURES] = term
+
+    def top_terms(self) -> List[List[str]]:
+        terms = []
+        for centroid in self.model.cluster_centers_:
+            top = np.argpartition(centroid, -self.TOP_TERMS)[-self.TOP_TERMS:]
+            indices = top[np.argsort(centroid[top])[::-1]]
+            terms.append([self.terms[i] for i in indices if centroid[i] > 0 and i in self.terms])
+        return terms
+
+    def vectorize(self, texts: List[str]) -> csr_matrix:
+        """Hashed term vectors for texts"""
+        return self.vectorizer.transform(texts)
+
+    def update(self, texts: List[str], X: Optional[csr_matrix] = None) -> Dict[str, Any]:
+        """
+        Fold this cycle's texts into the clusters; returns labels plus per-topic sizes and top terms.
+
+        Pass ``X`` when the texts' vectors were already computed with ``vectorize``,
+        here or by another clusterer; all clusterers share one hashed feature space.
+        """
+        if not texts or (not self.fitted and len(texts) < self.n_clusters):
+            return {'clusters': [], 'topics': []}
+
+        if X is None:
+            X = self.vectorize(texts)
+        self._remember_terms(texts)
+        self.model.partial_fit(X)
+        self.fitted = True
+        labels = self.model.predict(X)
+        self.save()
+
+        sizes = np.bincount(labels, minlength=self.n_clusters)
+        return {
+            'clusters': labels.tolist(),
+            'topics': [
+                {'id': topic, 'size': int(sizes[topic]), 'top_terms': terms}
+                for topic, terms in enumerate(self.top_terms())
+            ]
+        }
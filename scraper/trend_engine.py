@@ -0,0 +1,182 @@
+import heapq
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dedupe import RollingBloomFilter
+from post_record import PostRecord
+
+logger = logging.getLogger(__name__)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter summary holding at most ``capacity`` counters.
+
+    Counting an item already tracked is a dict increment. An untracked item
+    replaces the current minimum and inherits its count as the error bound, so
+    any item with a true count above total/capacity is always kept.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # Lazy min-heap: entries may hold stale (lower) counts and are refreshed on pop
+        self.heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1):
+        if item in self.counts:
+            self.counts[item] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self.heap, (count, item))
+            return
+
+        # Evict the true minimum; counts only grow, so stale entries are lower bounds
+        while True:
+            stale_count, victim = heapq.heappop(self.heap)
+            if self.counts[victim] == stale_count:
+                break
+            heapq.heappush(self.heap, (self.counts[victim], victim))
+        del self.counts[victim]
+        del self.errors[victim]
+        self.counts[item] = stale_count + count
+        self.errors[item] = stale_count
+        heapq.heappush(self.heap, (self.counts[item], item))
+
+    def items(self):
+        return ((item, count, self.errors[item]) for item, count in self.counts.items())
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        return {item: [count, self.errors[item]] for item, count in self.counts.items()}
+
+    @classmethod
+    def from_dict(cls, capacity: int, data: Dict[str, List[int]]) -> 'SpaceSaving':
+        summary = cls(capacity)
+        for item, (count, error) in data.items():
+            summary.counts[item] = count
+            summary.errors[item] = error
+        summary.heap = [(count, item) for item, count in summary.counts.items()]
+        heapq.heapify(summary.heap)
+        return summary
+
+
+class TrendEngine:
+    """
+    Per-category hashtag counts over sliding windows with bounded memory.
+
+    Each window is a ring of time buckets holding a Space-Saving summary; a post
+    updates one bucket per window, and expired buckets are dropped. Top hashtags
+    for a window are the merged bucket summaries, so queries need no search.
+    """
+
+    # window name -> (span seconds, bucket width seconds)
+    WINDOWS = {
+        '15m': (15 * 60, 60),
+        '1h': (60 * 60, 5 * 60),
+        '24h': (24 * 60 * 60, 60 * 60),
+    }
+
+    def __init__(self, capacity: int = 200, dedupe_capacity: int = 200_000):
+        self.capacity = capacity
+        # category -> window -> bucket index -> summary
+        self.buckets: Dict[str, Dict[str, Dict[int, SpaceSaving]]] = {}
+        self.latest = 0.0
+        # The same post is often new for several terms of one category
+        self.seen = RollingBloomFilter(capacity=dedupe_capacity)
+
+    def ingest(self, category: str, post: PostRecord) -> bool:
+        """Count a post's hashtags once per category; returns False for repeats"""
+        if self.seen.add(f'{category}|{post.uri}'):
+            return False
+        self.add(category, post.hashtags, post.created_at)
+        return True
+
+    def add(self, category: str, hashtags: Iterable[str], timestamp: float):
+        """Add one post's hashtags at timestamp (epoch seconds)"""
+        hashtags = list(hashtags)
+        if not hashtags:
+            return
+        self.latest = max(self.latest, timestamp)
+        windows = self.buckets.setdefault(category, {name: {} for name in self.WINDOWS})
+
+        for name, (span, width) in self.WINDOWS.items():
+            index = int(timestamp // width)
+            if index <= (self.latest - span) // width:
+                continue
+            buckets = windows[name]
+            summary = buckets.get(index)
+            if summary is None:
+                summary = buckets[index] = SpaceSaving(self.capacity)
+                self._expire(buckets, span, width)
+            for hashtag in hashtags:
+                summary.add(hashtag)
+
+    def _expire(self, buckets: Dict[int, SpaceSaving], span: int, width: int):
+        oldest = (self.latest - span) // width
+        for index in [index for index in buckets if index <= oldest]:
+            del buckets[index]
+
+    def top(self, category: str, window: str, n: int = 20, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Top n hashtags for a category and window, with each count's overestimate bound"""
+        span, width = self.WINDOWS[window]
+        oldest = ((now or self.latest) - span) // width
+        counts: Dict[str, List[int]] = {}
+        for index, summary in self.buckets.get(category, {}).get(window, {}).items():
+            if index <= oldest:
+                continue
+            for hashtag, count, error in summary.items():
+                totals = counts.setdefault(hashtag, [0, 0])
+                totals[0] += count
+                totals[1] += error
+
+        ranked = heapq.nlargest(n, counts.items(), key=lambda item: item[1][0])
+        return [{'hashtag': hashtag, 'count': count, 'max_error': error} for hashtag, (count, error) in ranked]
+
+    def top_all(self, category: str, n: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        return {window: self.top(category, window, n) for window in self.WINDOWS}
+
+    def save(self, path: str, n: int = 20):
+        """Persist the top hashtags plus the bucket state needed to resume"""
+        data = {
+            'latest': self.latest,
+            'top': {category: self.top_all(category, n) for category in self.buckets},
+            'buckets': {
+                category: {
+                    window: {str(index): summary.to_dict() for index, summary in buckets.items()}
+                    for window, buckets in windows.items()
+                }
+                for category, windows in self.buckets.items()
+            }
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(f'{path}.tmp', path)
+
+    def load(self, path: str):
+        """Restore bucket state written by save; a missing or unreadable file starts empty"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load trend engine state from {path}: {e}")
+            return
+
+        self.latest = data.get('latest', 0.0)
+        self.buckets = {
+            category: {
+                window: {
+                    int(index): SpaceSaving.from_dict(self.capacity, summary)
+                    for index, summary in windows.get(window, {}).items()
+                }
+                for window in self.WINDOWS
+            }
+            for category, windows in data.get('buckets', {}).items()
+        }